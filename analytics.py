@@ -0,0 +1,318 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from stats_engine import normality_screen
+
+MEMO_MAX_ENTRIES = 64
+PROFILE_COLUMN_BLOCK = 32
+# Cap on rows x columns per profiled block, so million-row logs are profiled a few columns at a time.
+PROFILE_BLOCK_MAX_CELLS = 4_000_000
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the whole frame: shape, column names/dtypes and every row.
+
+    Callers that know the source blob should key by that instead (frame_key);
+    this is the fallback, still far cheaper than the work it memoizes.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(df.shape).encode("utf-8"))
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+    if len(df):
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        except TypeError:
+            # Unhashable cells (lists, dicts) fall back to their string form.
+            row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+        digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+class FrameMemo:
+    """Process-wide LRU of derived artifacts keyed by (dataframe fingerprint, artifact name)."""
+
+    def __init__(self, max_entries: int = MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, fingerprint: str, name: str, compute: Callable[[], Any]) -> Any:
+        key = (fingerprint, name)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+_memo = FrameMemo()
+
+
+def get_frame_memo() -> FrameMemo:
+    return _memo
+
+
+def _numeric_block_profile(values: np.ndarray) -> dict:
+    """Per-column distinct count, longest run of equal values, and quartiles for a float block.
+
+    One sort of the block answers all three; NaNs sort to the end and are excluded.
+    """
+    n_rows, n_cols = values.shape
+    ordered = np.sort(values, axis=0)
+    valid = ~np.isnan(ordered)
+    valid_counts = valid.sum(axis=0)
+
+    change = np.ones_like(valid)
+    if n_rows > 1:
+        change[1:] = ordered[1:] != ordered[:-1]
+    change &= valid
+    distinct = change.sum(axis=0)
+
+    # Longest run of equal values: gaps between change positions (valid values sort first).
+    longest_run = np.zeros(n_cols, dtype=int)
+    for col in range(n_cols):
+        starts = np.flatnonzero(change[:, col])
+        if starts.size:
+            longest_run[col] = np.diff(starts, append=valid_counts[col]).max()
+
+    def _quantile(q):
+        # Linear interpolation between order statistics, matching Series.quantile's default.
+        position = (np.maximum(valid_counts, 1) - 1) * q
+        lower = np.floor(position).astype(int)
+        upper = np.ceil(position).astype(int)
+        cols = np.arange(n_cols)
+        low_vals = ordered[lower, cols] if n_rows else np.full(n_cols, np.nan)
+        high_vals = ordered[upper, cols] if n_rows else np.full(n_cols, np.nan)
+        return low_vals + (high_vals - low_vals) * (position - lower)
+
+    return {
+        "valid": valid_counts,
+        "distinct": distinct,
+        "longest_run": longest_run,
+        "q1": _quantile(0.25),
+        "q3": _quantile(0.75),
+    }
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    missing_by_column: Optional[pd.Series] = None,
+    duplicate_count: Optional[int] = None,
+) -> dict:
+    """Compute every Data Quality Profiler metric in one pass per column block."""
+    row_count = len(df)
+    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    object_cols = df.select_dtypes(exclude=["number"]).columns.tolist()
+
+    if missing_by_column is None:
+        missing_by_column = df.isna().sum()
+    if duplicate_count is None:
+        duplicate_count = int(df.duplicated().sum())
+    distinct = {}
+    top_count = {}
+    outlier_summary = {}
+
+    block_width = max(1, min(PROFILE_COLUMN_BLOCK, PROFILE_BLOCK_MAX_CELLS // max(row_count, 1)))
+    for start in range(0, len(numeric_cols), block_width):
+        block_cols = numeric_cols[start:start + block_width]
+        values = df[block_cols].to_numpy(dtype=float, na_value=np.nan)
+        block = _numeric_block_profile(values)
+
+        iqr = block["q3"] - block["q1"]
+        lower = block["q1"] - 1.5 * iqr
+        upper = block["q3"] + 1.5 * iqr
+        with np.errstate(invalid="ignore"):
+            outliers = ((values < lower) | (values > upper)).sum(axis=0)
+
+        for idx, col in enumerate(block_cols):
+            distinct[col] = int(block["distinct"][idx])
+            # value_counts(dropna=False) counts NaN as one value, so it can be the top entry.
+            top_count[col] = int(max(block["longest_run"][idx], missing_by_column[col]))
+            if block["valid"][idx] >= 5 and iqr[idx] != 0 and outliers[idx] > 0:
+                outlier_summary[col] = int(outliers[idx])
+
+    inconsistent_type_cols = []
+    for col in object_cols:
+        series = df[col]
+        counts = series.value_counts(dropna=False)
+        has_nan = bool(missing_by_column[col])
+        distinct[col] = len(counts) - (1 if has_nan else 0)
+        top_count[col] = int(counts.iloc[0]) if len(counts) else 0
+
+        sample = series.dropna().head(500)
+        if not sample.empty and sample.map(type).nunique() > 1:
+            inconsistent_type_cols.append(col)
+
+    constant_cols = [c for c in df.columns if distinct.get(c, 0) <= 1]
+    near_constant_cols = [
+        c for c in df.columns
+        if row_count and c not in constant_cols and top_count.get(c, 0) / row_count >= 0.95
+    ]
+
+    return {
+        "rows": row_count,
+        "columns": df.shape[1],
+        "missing_by_column": missing_by_column,
+        "missing_total": int(missing_by_column.sum()),
+        "duplicate_count": duplicate_count,
+        "distinct": distinct,
+        "constant_cols": constant_cols,
+        "near_constant_cols": near_constant_cols,
+        "inconsistent_type_cols": inconsistent_type_cols,
+        "outlier_summary": outlier_summary,
+    }
+
+
+class CorrelationEngine:
+    """Pairwise-complete Pearson correlation served from cached sufficient statistics.
+
+    For every pair of columns (a, b) seen so far it keeps the pairwise non-null
+    count, the sum and sum of squares of a over rows where both are present, and
+    the cross-product. Any column subset is then a slice of those matrices, and
+    adding m new columns to k known ones costs O(n * (k + m) * m) rather than a
+    full recompute. Results match DataFrame.corr() (pairwise deletion).
+    """
+
+    def __init__(self):
+        self.columns = []
+        self._position = {}
+        self._shift = {}
+        self._count = np.zeros((0, 0))
+        self._sum = np.zeros((0, 0))
+        self._sumsq = np.zeros((0, 0))
+        self._cross = np.zeros((0, 0))
+        self._lock = threading.Lock()
+
+    def _arrays(self, df: pd.DataFrame, columns):
+        values = df[columns].to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(values)
+        for idx, col in enumerate(columns):
+            if col not in self._shift:
+                column_values = values[present[:, idx], idx]
+                self._shift[col] = float(column_values.mean()) if column_values.size else 0.0
+        # Centering doesn't change r but keeps the sums well conditioned.
+        shift = np.array([self._shift[col] for col in columns])
+        centered = np.where(present, values - shift, 0.0)
+        return centered, present.astype(float)
+
+    def _extend(self, df: pd.DataFrame, new_columns) -> None:
+        known = len(self.columns)
+        total = known + len(new_columns)
+        all_columns = self.columns + new_columns
+
+        centered, present = self._arrays(df, all_columns)
+        new_centered = centered[:, known:]
+        new_present = present[:, known:]
+
+        def _grow(matrix):
+            grown = np.zeros((total, total))
+            grown[:known, :known] = matrix
+            return grown
+
+        count, sums, sumsq, cross = (_grow(m) for m in (self._count, self._sum, self._sumsq, self._cross))
+
+        count[:, known:] = present.T @ new_present
+        count[known:, :] = count[:, known:].T
+        sums[:, known:] = centered.T @ new_present
+        sums[known:, :] = (present.T @ new_centered).T
+        sumsq[:, known:] = (centered ** 2).T @ new_present
+        sumsq[known:, :] = (present.T @ new_centered ** 2).T
+        cross[:, known:] = centered.T @ new_centered
+        cross[known:, :] = cross[:, known:].T
+
+        self._count, self._sum, self._sumsq, self._cross = count, sums, sumsq, cross
+        self.columns = all_columns
+        self._position = {col: idx for idx, col in enumerate(all_columns)}
+
+    def corr(self, df: pd.DataFrame, columns) -> pd.DataFrame:
+        return self.corr_with_counts(df, columns)[0]
+
+    def corr_with_counts(self, df: pd.DataFrame, columns):
+        """Return (correlation, pairwise non-null count) frames for columns."""
+        with self._lock:
+            new_columns = [col for col in dict.fromkeys(columns) if col not in self._position]
+            if new_columns:
+                self._extend(df, new_columns)
+            idx = [self._position[col] for col in columns]
+            count = self._count[np.ix_(idx, idx)]
+            sums = self._sum[np.ix_(idx, idx)]
+            sumsq = self._sumsq[np.ix_(idx, idx)]
+            cross = self._cross[np.ix_(idx, idx)]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            numerator = count * cross - sums * sums.T
+            var_a = count * sumsq - sums ** 2
+            var_b = count * sumsq.T - sums.T ** 2
+            result = numerator / np.sqrt(var_a * var_b)
+        result[(count < 2) | (var_a <= 0) | (var_b <= 0)] = np.nan
+        result = np.clip(result, -1.0, 1.0)
+        diagonal = np.diag_indices(len(idx))
+        result[diagonal] = np.where(np.isnan(result[diagonal]), np.nan, 1.0)
+        labels = list(columns)
+        return (
+            pd.DataFrame(result, index=labels, columns=labels),
+            pd.DataFrame(count, index=labels, columns=labels),
+        )
+
+
+def frame_key(df: pd.DataFrame, source_sha: Optional[str] = None, sheet_name: Optional[str] = None) -> str:
+    """Memo key for df: exact when it was parsed from a known blob, otherwise a content fingerprint."""
+    if source_sha:
+        return f"blob:{source_sha}:{sheet_name or ''}"
+    return dataframe_fingerprint(df)
+
+
+def _memoized(df: pd.DataFrame, key: Optional[str], name: str, compute: Callable[[], Any]) -> Any:
+    return get_frame_memo().get_or_compute(key or dataframe_fingerprint(df), name, compute)
+
+
+def get_missing_counts(df: pd.DataFrame, key: Optional[str] = None) -> pd.Series:
+    return _memoized(df, key, "missing", lambda: df.isna().sum())
+
+
+def get_duplicate_count(df: pd.DataFrame, key: Optional[str] = None) -> int:
+    return _memoized(df, key, "duplicates", lambda: int(df.duplicated().sum()))
+
+
+def get_describe(df: pd.DataFrame, key: Optional[str] = None) -> pd.DataFrame:
+    return _memoized(df, key, "describe", lambda: df.describe(include="all"))
+
+
+def get_correlation(df: pd.DataFrame, columns, key: Optional[str] = None) -> pd.DataFrame:
+    engine = _memoized(df, key, "corr_engine", CorrelationEngine)
+    return engine.corr(df, list(columns))
+
+
+def get_correlation_with_counts(df: pd.DataFrame, columns, key: Optional[str] = None):
+    engine = _memoized(df, key, "corr_engine", CorrelationEngine)
+    return engine.corr_with_counts(df, list(columns))
+
+
+def get_normality_screen(df: pd.DataFrame, columns, key: Optional[str] = None) -> pd.DataFrame:
+    columns = list(columns)
+    return _memoized(df, key, f"normality:{columns!r}", lambda: normality_screen(df, columns))
+
+
+def get_profile(df: pd.DataFrame, key: Optional[str] = None) -> dict:
+    key = key or dataframe_fingerprint(df)
+    return _memoized(
+        df,
+        key,
+        "profile",
+        lambda: profile_dataframe(
+            df,
+            missing_by_column=get_missing_counts(df, key),
+            duplicate_count=get_duplicate_count(df, key),
+        ),
+    )
@@ -0,0 +1,132 @@
+import os
+import re
+import tempfile
+import threading
+from typing import Optional
+
+BLOB_CACHE_DIR = os.environ.get(
+    "KSURA_BLOB_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ksura", "blobs"),
+)
+BLOB_CACHE_MAX_BYTES = int(os.environ.get("KSURA_BLOB_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+
+class BlobCache:
+    """On-disk store of file bytes keyed by git blob SHA.
+
+    A blob SHA names immutable content, so entries never go stale; the only
+    reason to drop one is the size budget, which is enforced least-recently-used
+    first (file mtime is bumped on every hit).
+    """
+
+    def __init__(self, root: str = BLOB_CACHE_DIR, max_bytes: int = BLOB_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, sha: str) -> Optional[str]:
+        sha = (sha or "").lower()
+        if not _SHA_PATTERN.match(sha):
+            return None
+        return os.path.join(self.root, sha[:2], sha)
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if name.startswith("."):
+                    continue
+                path = os.path.join(prefix_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _ensure_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        return self._total_bytes
+
+    def get(self, sha: str) -> Optional[bytes]:
+        path = self._path(sha)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            os.utime(path, None)
+            return data
+        except OSError:
+            return None
+
+    def path_for(self, sha: str) -> Optional[str]:
+        """Path of a cached entry (bumping its recency), for callers that memory-map it."""
+        path = self._path(sha)
+        if not path:
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def put(self, sha: str, data: bytes) -> bool:
+        path = self._path(sha)
+        if not path or data is None or len(data) > self.max_bytes:
+            return False
+        if os.path.exists(path):
+            os.utime(path, None)
+            return True
+
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write to a temp file and rename so readers never see a partial blob.
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                return False
+
+            self._total_bytes = self._ensure_total() + len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        # Trim to 90% of the budget so a burst of puts doesn't rescan every time.
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+
+_shared_cache: Optional[BlobCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_blob_cache() -> BlobCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = BlobCache()
+        return _shared_cache
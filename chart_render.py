@@ -0,0 +1,289 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from matplotlib import style as mpl_style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import seaborn as sns
+
+from plot_reduction import (
+    axes_pixel_size,
+    bin_bars,
+    hexbin_gridsize,
+    is_numeric_axis,
+    line_buckets,
+    max_bars,
+    minmax_indices,
+    sample_indices,
+    scatter_limits,
+)
+
+RENDER_MAX_WORKERS = min(4, os.cpu_count() or 1)
+SINGLE_FIGSIZE = (6.4, 4.8)
+COMPARATIVE_FIGSIZE = (14, 6)
+
+CHART_TYPES = [
+    "Line Plot", "Bar Plot", "Scatter Plot", "Histogram",
+    "Box Plot", "Heatmap", "Violin Plot", "Trend Analysis",
+]
+CHART_STYLES = ["Default", "Seaborn", "ggplot (R-style)", "FiveThirtyEight", "Dark Mode"]
+CHART_STYLE_MAP = {
+    "Default": "default",
+    "Seaborn": "seaborn-v0_8",
+    "ggplot (R-style)": "ggplot",
+    "FiveThirtyEight": "fivethirtyeight",
+    "Dark Mode": "dark_background",
+}
+
+
+def _new_figure(figsize) -> Figure:
+    # A bare Figure with its own Agg canvas: no pyplot figure manager, nothing global to clean up.
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _figure_png(fig: Figure, **savefig_kwargs) -> bytes:
+    buf = BytesIO()
+    fig.savefig(buf, format="png", **savefig_kwargs)
+    return buf.getvalue()
+
+
+def _line_rows(df, y, width_px, notes):
+    """Row positions to draw for a line series: min/max decimated to the axes width when numeric."""
+    if not is_numeric_axis(df[y]):
+        return slice(None)
+    rows = minmax_indices(df[y].to_numpy(dtype=float, na_value=np.nan), line_buckets(width_px))
+    if len(rows) < len(df):
+        notes.append(f"{y}: min/max decimated to {len(rows):,} of {len(df):,} points")
+    return rows
+
+
+def _render_chart_on_ax(df, x_axis, y_axis, plot_type, ax, custom_title=None, custom_x_label=None, custom_y_label=None):
+    """Render a single chart type onto ax. Returns False for Pair Plot (unsupported on an axis).
+
+    Line, scatter, bar and trend charts are first reduced to what the axes can
+    show at their pixel size (see plot_reduction), and any reduction is noted
+    in the corner of the chart.
+    """
+    default_title = plot_type
+    width_px, height_px = axes_pixel_size(ax)
+    notes = []
+    if plot_type == "Line Plot":
+        for y in y_axis:
+            rows = _line_rows(df, y, width_px, notes)
+            ax.plot(df[x_axis[0]].iloc[rows], df[y].iloc[rows], label=y)
+        default_title = "Line Plot"
+    elif plot_type == "Bar Plot":
+        bar_limit = max_bars(width_px)
+        if len(df) > bar_limit:
+            grouped, width, note = bin_bars(df, x_axis[0], list(y_axis), bar_limit)
+            notes.append(note)
+            for y in y_axis:
+                ax.bar(grouped.index, grouped[y], label=y, **({"width": width} if width else {}))
+        else:
+            for y in y_axis:
+                ax.bar(df[x_axis[0]], df[y], label=y)
+        default_title = "Bar Plot"
+    elif plot_type == "Scatter Plot":
+        x_values = df[x_axis[0]]
+        point_limit, sample_size = scatter_limits(width_px, height_px)
+        dense = len(df) > point_limit
+        if dense and len(y_axis) == 1 and is_numeric_axis(x_values) and is_numeric_axis(df[y_axis[0]]):
+            x_arr = x_values.to_numpy(dtype=float, na_value=np.nan)
+            y_arr = df[y_axis[0]].to_numpy(dtype=float, na_value=np.nan)
+            valid = ~(np.isnan(x_arr) | np.isnan(y_arr))
+            cells = ax.hexbin(
+                x_arr[valid], y_arr[valid],
+                gridsize=hexbin_gridsize(width_px), mincnt=1, cmap="viridis", label=y_axis[0],
+            )
+            ax.figure.colorbar(cells, ax=ax, label="points per cell")
+            notes.append(f"hexbin density of {int(valid.sum()):,} points")
+        else:
+            rows = slice(None)
+            if dense:
+                rows = sample_indices(len(df), sample_size)
+                notes.append(f"random sample of {sample_size:,} of {len(df):,} points")
+            for y in y_axis:
+                ax.scatter(x_values.iloc[rows], df[y].iloc[rows], label=y)
+        default_title = "Scatter Plot"
+    elif plot_type == "Histogram":
+        for x in x_axis:
+            ax.hist(df[x], bins=20, alpha=0.5, label=x)
+        default_title = "Histogram"
+    elif plot_type == "Box Plot":
+        sns.boxplot(data=df[y_axis], ax=ax)
+        default_title = "Box Plot"
+    elif plot_type == "Heatmap":
+        sns.heatmap(df.corr(numeric_only=True), annot=True, cmap="coolwarm", ax=ax)
+        default_title = "Heatmap"
+    elif plot_type == "Violin Plot":
+        sns.violinplot(data=df[y_axis], ax=ax)
+        default_title = "Violin Plot"
+    elif plot_type == "Trend Analysis":
+        for y in y_axis:
+            rows = _line_rows(df, y, width_px, notes)
+            positions = np.arange(len(df))[rows]
+            ax.plot(df[x_axis[0]].iloc[rows], df[y].iloc[rows], label=y, marker='o')
+            # The fit still uses every row; only the drawn points are reduced.
+            z = np.polyfit(range(len(df)), df[y], 1)
+            p = np.poly1d(z)
+            ax.plot(df[x_axis[0]].iloc[rows], p(positions), "--", alpha=0.7, label=f"{y} trend")
+        default_title = "Trend Analysis"
+    elif plot_type == "Pair Plot":
+        return False
+
+    if notes:
+        ax.annotate(
+            "; ".join(notes), xy=(1, 0), xycoords="axes fraction", xytext=(-4, 4),
+            textcoords="offset points", ha="right", va="bottom", fontsize=7, alpha=0.7,
+        )
+    ax.set_title(custom_title if custom_title else default_title)
+    ax.set_xlabel(custom_x_label if custom_x_label else (", ".join(x_axis) if x_axis else ""))
+    ax.set_ylabel(custom_y_label if custom_y_label else (", ".join(y_axis) if y_axis else ""))
+    ax.legend()
+    return True
+
+
+def _single_png(df, spec) -> bytes:
+    fig = _new_figure(SINGLE_FIGSIZE)
+    ax = fig.subplots()
+    _render_chart_on_ax(
+        df, spec["x_axis"], spec["y_axis"], spec["plot_type"], ax,
+        custom_title=spec["title"],
+        custom_x_label=spec["x_label"],
+        custom_y_label=spec["y_label"],
+    )
+    return _figure_png(fig)
+
+
+def _comparative_png(df, spec) -> Optional[bytes]:
+    """Both charts side by side on one figure; None if either chart can't be drawn on an axis."""
+    first, second = spec["charts"]
+    fig = _new_figure(COMPARATIVE_FIGSIZE)
+    ax1, ax2 = fig.subplots(1, 2)
+    for chart, ax in ((first, ax1), (second, ax2)):
+        ok = _render_chart_on_ax(
+            df, chart["x_axis"], chart["y_axis"], chart["plot_type"], ax,
+            custom_title=chart["title"],
+            custom_x_label=spec["x_label"],
+            custom_y_label=spec["y_label"],
+        )
+        if not ok:
+            return None
+    if spec["align_x"]:
+        xmin = min(ax1.get_xlim()[0], ax2.get_xlim()[0])
+        xmax = max(ax1.get_xlim()[1], ax2.get_xlim()[1])
+        ax1.set_xlim(xmin, xmax)
+        ax2.set_xlim(xmin, xmax)
+    if spec["align_y"]:
+        ymin = min(ax1.get_ylim()[0], ax2.get_ylim()[0])
+        ymax = max(ax1.get_ylim()[1], ax2.get_ylim()[1])
+        ax1.set_ylim(ymin, ymax)
+        ax2.set_ylim(ymin, ymax)
+    fig.suptitle("Comparative Visualization", fontsize=13)
+    fig.tight_layout()
+    return _figure_png(fig, bbox_inches="tight")
+
+
+def _pair_plot_png(df, spec) -> bytes:
+    # PairGrid always builds its own pyplot figure, so close it explicitly.
+    import matplotlib.pyplot as plt
+
+    grid = sns.pairplot(df[spec["x_axis"] + spec["y_axis"]])
+    try:
+        return _figure_png(grid.figure)
+    finally:
+        plt.close(grid.figure)
+
+
+_RENDERERS = {
+    "single": _single_png,
+    "comparative": _comparative_png,
+    "pair": _pair_plot_png,
+}
+
+
+def render_chart_task(args) -> Optional[bytes]:
+    """Worker entry point: render one chart spec to PNG bytes under its style context."""
+    kind, df, spec = args
+    style_name = spec["charts"][0]["style"] if kind == "comparative" else spec["style"]
+    with mpl_style.context(CHART_STYLE_MAP.get(style_name, "default")):
+        return _RENDERERS[kind](df, spec)
+
+
+def spec_columns(kind: str, spec: dict, columns) -> List:
+    """Columns a render needs, so only those are shipped to the worker process."""
+    charts = spec["charts"] if kind == "comparative" else [spec]
+    if any(chart["plot_type"] == "Heatmap" for chart in charts):
+        return list(columns)
+    needed = []
+    for chart in charts:
+        needed.extend(chart["x_axis"])
+        needed.extend(chart["y_axis"])
+    return [col for col in dict.fromkeys(needed) if col in columns]
+
+
+class RenderService:
+    """Renders chart specs to PNG bytes on a bounded process pool.
+
+    Each worker process has its own matplotlib state, so style contexts
+    can't leak between concurrent users, and a slow render doesn't hold
+    up other sessions' script threads. If the pool can't be used, renders
+    run in-process, one at a time, since style contexts modify the global rcParams.
+    """
+
+    def __init__(self, max_workers: int = RENDER_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pool_broken = max_workers < 1
+        self._lock = threading.Lock()
+        self._inline_lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None and not self._pool_broken:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except Exception:
+                    self._pool_broken = True
+            return self._executor
+
+    def render(self, kind: str, df: pd.DataFrame, spec: dict) -> Optional[bytes]:
+        task = (kind, df[spec_columns(kind, spec, df.columns)], spec)
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                future = executor.submit(render_chart_task, task)
+            except Exception:
+                with self._lock:
+                    self._executor = None
+                    self._pool_broken = True
+            else:
+                try:
+                    return future.result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. out of memory); start a fresh pool next time.
+                    with self._lock:
+                        self._executor = None
+        with self._inline_lock:
+            return render_chart_task(task)
+
+
+_shared_service: Optional[RenderService] = None
+_shared_lock = threading.Lock()
+
+
+def get_render_service() -> RenderService:
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = RenderService()
+        return _shared_service
@@ -0,0 +1,250 @@
+import codecs
+import csv
+import zipfile
+from io import BytesIO
+from typing import Callable, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+SNIFF_SAMPLE_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ",;\t|"
+STREAM_INGEST_MIN_BYTES = 20 * 1024 * 1024
+STREAM_CHUNK_ROWS = 250_000
+# Tried in order when a file sniffed as UTF-8 turns out not to be past the sample.
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Pick an encoding from a byte sample: BOM, then strict UTF-8, else latin-1 (which never fails)."""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # Incremental decode tolerates a multi-byte character cut off at the end of the sample.
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def candidate_encodings(encoding: str) -> List[str]:
+    """The sniffed encoding, then the 8-bit fallbacks if it was a UTF-8 guess."""
+    if not encoding.startswith("utf-8"):
+        return [encoding]
+    return [encoding] + [fallback for fallback in FALLBACK_ENCODINGS if fallback != encoding]
+
+
+def detect_delimiter(sample_text: str, default_sep: str = ",") -> str:
+    lines = [line for line in sample_text.splitlines()[:50] if line.strip()]
+    # Drop the last line: the sample boundary may have cut it short.
+    if len(lines) > 2:
+        lines = lines[:-1]
+    if not lines:
+        return default_sep
+
+    default_counts = {line.count(default_sep) for line in lines}
+    if len(default_counts) == 1 and default_counts.pop() > 0:
+        return default_sep
+
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        return default_sep
+
+
+def sniff_delimited(content: bytes, default_sep: str = ",") -> dict:
+    """Detect encoding and delimiter from a bounded sample of content."""
+    sample = content[:SNIFF_SAMPLE_BYTES]
+    encoding = detect_encoding(sample)
+    sample_text = sample.decode(encoding, errors="ignore")
+    return {"encoding": encoding, "delimiter": detect_delimiter(sample_text, default_sep)}
+
+
+def read_delimited(content: bytes, default_sep: str = ",") -> Tuple[Optional[pd.DataFrame], Optional[str], dict]:
+    """Parse CSV/TSV bytes in one pass after sniffing the dialect.
+
+    Returns (df, error, dialect) where dialect records the encoding, delimiter
+    and parser engine that were used.
+    """
+    dialect = sniff_delimited(content, default_sep)
+    decode_error = None
+    # The encoding is sniffed from the first SNIFF_SAMPLE_BYTES only; a non-UTF-8
+    # byte further in surfaces as UnicodeDecodeError, and we re-parse once per fallback.
+    for encoding in candidate_encodings(dialect["encoding"]):
+        attempt = {**dialect, "encoding": encoding}
+        try:
+            df = pd.read_csv(
+                BytesIO(content),
+                sep=attempt["delimiter"],
+                encoding=encoding,
+                engine="c",
+            )
+            return df, None, {**attempt, "engine": "c"}
+        except UnicodeDecodeError as exc:
+            decode_error = decode_error or exc
+            continue
+        except Exception as exc:
+            c_error = exc
+
+        # The python engine copes with some malformed files (irregular quoting) the C engine rejects.
+        try:
+            df = pd.read_csv(
+                BytesIO(content),
+                sep=attempt["delimiter"],
+                encoding=encoding,
+                engine="python",
+            )
+            return df, None, {**attempt, "engine": "python"}
+        except UnicodeDecodeError as exc:
+            decode_error = decode_error or exc
+            continue
+        except Exception:
+            return None, str(c_error), attempt
+
+    return None, str(decode_error), dialect
+
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink numeric columns in place where it is lossless.
+
+    int64 columns go to int32 when the range fits (not smaller, so ordinary
+    arithmetic downstream doesn't overflow); float64 columns go to float32 only
+    when every value round-trips exactly.
+    """
+    int32 = np.iinfo(np.int32)
+    for col in df.select_dtypes(include=["int64"]).columns:
+        values = df[col].to_numpy()
+        if values.size and values.min() >= int32.min and values.max() <= int32.max:
+            df[col] = values.astype(np.int32)
+    for col in df.select_dtypes(include=["float64"]).columns:
+        values = df[col].to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            df[col] = narrowed
+    return df
+
+
+def _column_dtype(dtypes: list):
+    """Common numpy dtype for one column's chunks, or None to let pandas combine them."""
+    if not all(isinstance(dtype, np.dtype) for dtype in dtypes):
+        return None
+    if len(set(dtypes)) == 1:
+        return dtypes[0]
+    # pandas (unlike numpy) never widens booleans to numbers; mixed chunks become object.
+    if any(dtype == np.bool_ for dtype in dtypes):
+        return np.dtype(object)
+    return np.result_type(*dtypes)
+
+
+def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Stack same-schema chunks, releasing each one as it is copied in.
+
+    pd.concat keeps every chunk alive until the result is built (about twice
+    the final size). Here numpy columns are preallocated and filled chunk by
+    chunk (untouched pages of np.empty cost nothing), so the peak stays near
+    the final frame plus one chunk. Extension columns (e.g. pandas strings)
+    are combined one column at a time at the end. chunks is emptied.
+    """
+    columns = chunks[0].columns
+    total = sum(len(chunk) for chunk in chunks)
+    dtypes = [_column_dtype([chunk.dtypes.iloc[pos] for chunk in chunks]) for pos in range(len(columns))]
+    arrays = [np.empty(total, dtype=dtype) if dtype is not None else None for dtype in dtypes]
+    pieces = [[] if dtype is None else None for dtype in dtypes]
+
+    offset = 0
+    while chunks:
+        chunk = chunks.pop(0)
+        end = offset + len(chunk)
+        for pos in range(len(columns)):
+            if arrays[pos] is not None:
+                arrays[pos][offset:end] = chunk.iloc[:, pos].to_numpy()
+            else:
+                pieces[pos].append(chunk.iloc[:, pos])
+        offset = end
+        del chunk
+
+    for pos in range(len(columns)):
+        if arrays[pos] is None:
+            arrays[pos] = pd.concat(pieces[pos], ignore_index=True).array
+            pieces[pos] = None
+    df = pd.DataFrame(dict(enumerate(arrays)), copy=False)
+    df.columns = columns
+    return df
+
+
+def read_delimited_chunked(
+    content: bytes,
+    default_sep: str = ",",
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    on_chunk: Optional[Callable[[pd.DataFrame, int, float], None]] = None,
+) -> Tuple[Optional[pd.DataFrame], Optional[str], dict]:
+    """Parse large CSV/TSV/.dat bytes in row chunks, downcasting each chunk as it arrives.
+
+    The bytes are parsed directly (no decoded copy of the text is held), and
+    on_chunk(chunk, rows_loaded, fraction_of_bytes_read) lets callers show the
+    first rows before the rest of the file has been read.
+    """
+    sniffed = {**sniff_delimited(content, default_sep), "engine": "c", "chunked": True}
+    total_bytes = max(len(content), 1)
+    decode_error = None
+    for encoding in candidate_encodings(sniffed["encoding"]):
+        dialect = {**sniffed, "encoding": encoding}
+        buffer = BytesIO(content)
+        chunks = []
+        rows_loaded = 0
+        try:
+            reader = pd.read_csv(
+                buffer,
+                sep=dialect["delimiter"],
+                encoding=encoding,
+                engine="c",
+                chunksize=chunk_rows,
+            )
+            for chunk in reader:
+                chunk = downcast_frame(chunk)
+                chunks.append(chunk)
+                rows_loaded += len(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk, rows_loaded, min(buffer.tell() / total_bytes, 1.0))
+        except UnicodeDecodeError as exc:
+            # A non-UTF-8 byte past the sniffed sample: start over with the next encoding.
+            decode_error = decode_error or exc
+            continue
+        except Exception as exc:
+            return None, str(exc), dialect
+        break
+    else:
+        return None, str(decode_error), sniffed
+
+    if not chunks:
+        return pd.DataFrame(), None, dialect
+    if len(chunks) == 1:
+        return chunks[0], None, dialect
+    return concat_chunks(chunks), None, dialect
+
+
+def list_workbook_sheets(content: bytes) -> List[str]:
+    """Sheet names in workbook order.
+
+    For xlsx this reads only xl/workbook.xml from the zip, without touching any
+    worksheet XML; legacy .xls (and anything unusual) falls back to pandas.
+    """
+    buffer = BytesIO(content)
+    if zipfile.is_zipfile(buffer):
+        try:
+            with zipfile.ZipFile(buffer) as archive:
+                manifest = archive.read("xl/workbook.xml")
+            root = ET.fromstring(manifest)
+        except (KeyError, zipfile.BadZipFile, ET.ParseError):
+            root = None
+        if root is not None:
+            # Match on local names so both transitional and strict OOXML namespaces work.
+            for element in root:
+                if element.tag.rsplit("}", 1)[-1] == "sheets":
+                    return [
+                        sheet.get("name")
+                        for sheet in element
+                        if sheet.tag.rsplit("}", 1)[-1] == "sheet" and sheet.get("name")
+                    ]
+    return pd.ExcelFile(BytesIO(content)).sheet_names
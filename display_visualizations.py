@@ -1,12 +1,20 @@
 import streamlit as st
-from xml.etree import ElementTree as ET
 from io import BytesIO
 import base64
+import math
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from github_client import get_github_client
+from thumbnails import get_thumbnail_cache, make_thumbnail
+from repo_index import get_repo_tree_index
+from viz_catalog import SORT_ORDERS, load_catalog
 
 warnings.filterwarnings("ignore")
 
+GALLERY_PAGE_SIZES = {"Gallery": 8, "Grid": 12, "List": 25}
+GALLERY_FETCH_WORKERS = 6
+GALLERY_MAX_PREPARED_DOWNLOADS = 3
+
 # Helper to render badges safely (fall back if st.badge isn't available)
 def render_badge(text):
     try:
@@ -52,12 +60,109 @@ def display_image_compatible(img_bytesio, caption=None):
         st.warning(f"Unable to display image: {e}")
         return None
 
+def resolve_blob_shas(client, tree_index, paths):
+    """Blob SHA for each path: from the tree index, else one (ETag-revalidated) folder listing per folder.
+
+    Without a SHA the thumbnail cache can't be consulted, so a stale,
+    truncated or missing tree index would otherwise mean downloading every
+    full-size image on every rerun. Paths neither source knows map to None.
+    """
+    shas = {path: tree_index.blob_sha(path) if tree_index is not None else None for path in paths}
+    folders = {path.rpartition("/")[0] for path, sha in shas.items() if not sha}
+    for folder in sorted(folders):
+        items, _, _ = client.list_contents(folder)
+        listed = {item.get("path"): item.get("sha") for item in items or [] if item.get("type") == "file"}
+        for path in shas:
+            if not shas[path] and path.rpartition("/")[0] == folder:
+                shas[path] = listed.get(path)
+    return shas
+
+
+def load_thumbnail(client, blob_shas, image, asset="Thumbnail"):
+    """Thumbnail bytes for one catalog entry, or (None, error).
+
+    Entries uploaded with a stored thumbnail/preview (asset names the catalog
+    field) are served from that file. Older entries get a thumbnail generated
+    here from the full image the first time, kept in the on-disk thumbnail
+    cache keyed by the image's blob SHA, so later views of an unchanged image
+    don't download it at all.
+    """
+    stored_path = image.get(asset)
+    if stored_path:
+        stored_bytes, _, _, _ = client.get_file_content(stored_path, sha=blob_shas.get(stored_path))
+        if stored_bytes is not None:
+            return stored_bytes, None
+
+    path = image["Path"]
+    cache = get_thumbnail_cache()
+    sha = blob_shas.get(path)
+    cached = cache.get(sha)
+    if cached is not None:
+        return cached, None
+
+    file_bytes, file_error, _, metadata = client.get_file_content(path, sha=sha)
+    if file_bytes is None:
+        return None, file_error or "Missing file content"
+    thumbnail = make_thumbnail(file_bytes)
+    if thumbnail is None:
+        return file_bytes, None
+    cache.put((metadata or {}).get("sha") or sha, thumbnail[0])
+    return thumbnail[0], None
+
+
+def load_page_thumbnails(client, tree_index, images, asset="Thumbnail"):
+    """Thumbnails (or previews) for one page of entries, fetched in parallel."""
+    if not images:
+        return []
+    paths = {image["Path"] for image in images} | {image[asset] for image in images if image.get(asset)}
+    blob_shas = resolve_blob_shas(client, tree_index, paths)
+    with ThreadPoolExecutor(max_workers=min(GALLERY_FETCH_WORKERS, len(images))) as executor:
+        return list(executor.map(lambda image: load_thumbnail(client, blob_shas, image, asset), images))
+
+
+def render_full_resolution_download(client, tree_index, image, key):
+    """A Download button that fetches the full-resolution image only when clicked."""
+    prepared = st.session_state.setdefault("viz_prepared_downloads", {})
+    path = image["Path"]
+    if path not in prepared:
+        if not st.button("Download", key=f"prepare_{key}"):
+            return
+        sha = tree_index.blob_sha(path) if tree_index is not None else None
+        file_bytes, file_error, _, _ = client.get_file_content(path, sha=sha)
+        if file_bytes is None:
+            st.caption(f"Unavailable: {file_error or 'missing file content'}")
+            return
+        prepared[path] = file_bytes
+        while len(prepared) > GALLERY_MAX_PREPARED_DOWNLOADS:
+            prepared.pop(next(iter(prepared)))
+    st.download_button(
+        label="Save PNG",
+        data=prepared[path],
+        file_name=image["Name"],
+        mime="image/png",
+        key=f"download_{key}",
+    )
+
+
+def render_pagination(total, page_size, signature):
+    """Page picker; jumps back to page 1 whenever the search, sort or view changes."""
+    page_count = max(1, math.ceil(total / page_size))
+    if st.session_state.get("viz_page_signature") != signature:
+        st.session_state["viz_page_signature"] = signature
+        st.session_state["viz_page"] = 1
+    if st.session_state.get("viz_page", 1) > page_count:
+        st.session_state["viz_page"] = page_count
+    if page_count == 1:
+        return 1
+    return int(st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key="viz_page"))
+
+
 def main():
     
     # Visualization management options
     col1, col2, col3 = st.columns(3)
     with col1:
-        sort_by = st.selectbox("Sort by:", ["Date (Newest)", "Date (Oldest)", "Name (A-Z)", "Name (Z-A)"])
+        sort_by = st.selectbox("Sort by:", SORT_ORDERS)
     with col2:
         search_viz = st.text_input("Search:", placeholder="Search by name or description", key="search_viz")
     with col3:
@@ -69,83 +174,61 @@ def main():
         st.warning("Please provide your security token on the Visualizations page to proceed.")
         return
 
-    # Step 2: Fetch and parse visualizations.xml
-    xml_path = "Visualizations/visualizations.xml"
+    # Step 2: Load the catalog (legacy XML + monthly shards, blob-cached; index built once per set of SHAs)
     try:
         client = get_github_client(token)
-        xml_bytes, xml_error, auth_error, _ = client.get_file_content(xml_path)
+        tree_index, _, _ = get_repo_tree_index(client)
+        catalog, catalog_error, auth_error = load_catalog(client, tree_index)
         if auth_error:
             st.session_state['gh_token'] = None
             st.session_state['gh_token_validated'] = False
             st.error("Authentication failed. Please re-enter your security token.")
             return
-        if xml_bytes is None:
-            raise ValueError(xml_error or "Could not load visualization catalog.")
-
-        xml_content = BytesIO(xml_bytes)
-        tree = ET.parse(xml_content)
-        root = tree.getroot()
+        if catalog is None:
+            raise ValueError(catalog_error or "Could not load visualization catalog.")
 
-        images = root.findall("Image")
-        if not images:
+        if not catalog.size:
             st.info("No visualizations found.")
             return
-        
-        
     except Exception as e:
         st.error(f"Could not fetch visualizations: {e}")
         return
 
-    # Filter and sort visualizations
-    filtered_images = images
-    if search_viz:
-        filtered_images = [img for img in images if search_viz.lower() in (img.findtext("Name", "").lower() + img.findtext("Description", "").lower())]
-    
-    # Sort visualizations
-    if sort_by == "Date (Newest)":
-        filtered_images = sorted(filtered_images, key=lambda x: x.findtext("Date", ""), reverse=True)
-    elif sort_by == "Date (Oldest)":
-        filtered_images = sorted(filtered_images, key=lambda x: x.findtext("Date", ""))
-    elif sort_by == "Name (A-Z)":
-        filtered_images = sorted(filtered_images, key=lambda x: x.findtext("Name", ""))
-    elif sort_by == "Name (Z-A)":
-        filtered_images = sorted(filtered_images, key=lambda x: x.findtext("Name", ""), reverse=True)
-    
-    st.write(f"**Showing {len(filtered_images)} of {len(images)} visualizations**")
-    
+    # Filter and sort visualizations; only the current page's rows are materialized
+    matches = catalog.search(search_viz, sort_by)
+    page_size = GALLERY_PAGE_SIZES[view_mode]
+    page = render_pagination(len(matches), page_size, (search_viz, sort_by, view_mode))
+    first = (page - 1) * page_size
+    page_images = [catalog.row(idx) for idx in matches[first:first + page_size]]
+
+    if len(matches):
+        st.write(
+            f"**Showing {first + 1}–{first + len(page_images)} of {len(matches)} matching "
+            f"({catalog.size} visualizations)**"
+        )
+    else:
+        st.write(f"**Showing 0 of {catalog.size} visualizations**")
+
     # Step 3: Display visualizations based on view mode
     if view_mode == "Gallery":
-        for image in filtered_images:
-            name = image.findtext("Name", "")
-            path = image.findtext("Path", "")
-            description = image.findtext("Description", "")
-            date = image.findtext("Date", "")
+        thumbnails = load_page_thumbnails(client, tree_index, page_images, asset="Preview")
+        for i, (image, (thumb_bytes, thumb_error)) in enumerate(zip(page_images, thumbnails)):
+            name = image["Name"]
+            description = image["Description"]
+            date = image["Date"]
 
             col1, col2 = st.columns([2, 3])
             with col1:
-                # Fetch the image file from GitHub
-                try:
-                    file_bytes, file_error, _, _ = client.get_file_content(path)
-                    if file_bytes is None:
-                        raise ValueError(file_error or "Missing file content")
-                    file_content = BytesIO(file_bytes)
-                    display_image_compatible(file_content)
-
-                    # Download button for each visualization
-                    st.download_button(
-                        label="Download",
-                        data=file_bytes,
-                        file_name=name,
-                        mime="image/png",
-                        key=f"download_{name}"
-                    )
-                except Exception as e:
-                    st.warning(f"Could not load image: {name} — {e}")
+                if thumb_bytes is None:
+                    st.warning(f"Could not load image: {name} — {thumb_error}")
+                else:
+                    display_image_compatible(BytesIO(thumb_bytes))
+                    render_full_resolution_download(client, tree_index, image, f"gallery_{first + i}")
             with col2:
                 st.subheader(name)
                 st.caption(f"Created: {date}")
                 st.write(description)
-                
+
                 # Tags or categories (if available)
                 if "soil" in description.lower():
                     render_badge("Soil Health")
@@ -154,46 +237,29 @@ def main():
                 if "trend" in description.lower():
                     render_badge("Trends")
             st.markdown("---")
-    
+
     elif view_mode == "Grid":
         # Grid layout with 3 columns
+        thumbnails = load_page_thumbnails(client, tree_index, page_images)
         cols = st.columns(3)
-        for i, image in enumerate(filtered_images):
+        for i, (image, (thumb_bytes, thumb_error)) in enumerate(zip(page_images, thumbnails)):
             with cols[i % 3]:
-                name = image.findtext("Name", "")
-                path = image.findtext("Path", "")
-                date = image.findtext("Date", "")
-                
-                try:
-                    file_bytes, file_error, _, _ = client.get_file_content(path)
-                    if file_bytes is None:
-                        raise ValueError(file_error or "Missing file content")
-                    file_content = BytesIO(file_bytes)
-                    display_image_compatible(file_content)
-                    st.caption(f"**{name}**")
-                    st.caption(f"{date}")
-                    st.download_button(
-                        label="Download",
-                        data=file_bytes,
-                        file_name=name,
-                        mime="image/png",
-                        key=f"download_grid_{name}_{i}"
-                    )
-                except Exception as e:
-                    st.warning(f"Could not load: {name} — {e}")
-    
-    else:  # List view
-        for i, image in enumerate(filtered_images):
-            name = image.findtext("Name", "")
-            path = image.findtext("Path", "")
-            description = image.findtext("Description", "")
-            date = image.findtext("Date", "")
-
-            file_bytes = None
-            try:
-                file_bytes, _, _, _ = client.get_file_content(path)
-            except Exception:
-                pass
+                name = image["Name"]
+                date = image["Date"]
+
+                if thumb_bytes is None:
+                    st.warning(f"Could not load: {name} — {thumb_error}")
+                    continue
+                display_image_compatible(BytesIO(thumb_bytes))
+                st.caption(f"**{name}**")
+                st.caption(f"{date}")
+                render_full_resolution_download(client, tree_index, image, f"grid_{first + i}")
+
+    else:  # List view: no image bytes are fetched until a download is requested
+        for i, image in enumerate(page_images):
+            name = image["Name"]
+            description = image["Description"]
+            date = image["Date"]
 
             with st.container():
                 col1, col2, col3, col4 = st.columns([3, 5, 2, 2])
@@ -204,16 +270,7 @@ def main():
                 with col3:
                     st.write(date)
                 with col4:
-                    if file_bytes:
-                        st.download_button(
-                            label="Download",
-                            data=file_bytes,
-                            file_name=name,
-                            mime="image/png",
-                            key=f"download_list_{name}_{i}"
-                        )
-                    else:
-                        st.caption("Unavailable")
+                    render_full_resolution_download(client, tree_index, image, f"list_{first + i}")
             st.markdown("---")
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("KSURA_FIGURE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Which axis selections each chart type actually reads; the rest are dropped from the key.
+_USES_X = {"Line Plot", "Bar Plot", "Scatter Plot", "Histogram", "Pair Plot", "Trend Analysis"}
+_USES_Y = {"Line Plot", "Bar Plot", "Scatter Plot", "Box Plot", "Violin Plot", "Pair Plot", "Trend Analysis"}
+
+
+def normalize_chart_spec(spec: dict) -> dict:
+    """Canonical form of a chart spec: blank labels become None, unused axis selections are dropped.
+
+    Nested "charts" lists (comparative mode) are normalized element-wise.
+    """
+    normalized = {}
+    plot_type = spec.get("plot_type")
+    for name, value in spec.items():
+        if isinstance(value, str):
+            value = value.strip() or None
+        elif isinstance(value, (list, tuple)) and name == "charts":
+            value = [normalize_chart_spec(item) for item in value]
+        elif isinstance(value, (list, tuple)):
+            value = [str(item) for item in value]
+        if name == "x_axis" and plot_type and plot_type not in _USES_X:
+            value = []
+        if name == "y_axis" and plot_type and plot_type not in _USES_Y:
+            value = []
+        normalized[name] = value
+    return normalized
+
+
+def chart_cache_key(spec: dict, data_key: str) -> str:
+    payload = json.dumps(normalize_chart_spec(spec), sort_keys=True, default=str)
+    return hashlib.sha1(f"{data_key}\0{payload}".encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+    """Process-wide LRU of rendered PNG bytes keyed by chart spec + data fingerprint, bounded by total size."""
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> bool:
+        if data is None or len(data) > self.max_bytes:
+            return False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous)
+            self._entries[key] = data
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+        return True
+
+    def stats(self) -> Tuple[int, int]:
+        with self._lock:
+            return self.hits, self.misses
+
+
+_shared_cache: Optional[FigureCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_figure_cache() -> FigureCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FigureCache()
+        return _shared_cache
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import threading
+from typing import Optional, Tuple
+
+from blob_cache import BlobCache
+
+try:
+    import pyarrow as pa
+except Exception:
+    pa = None
+
+FRAME_CACHE_DIR = os.environ.get(
+    "KSURA_FRAME_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ksura", "frames"),
+)
+FRAME_CACHE_MAX_BYTES = int(os.environ.get("KSURA_FRAME_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+
+
+class FrameSidecarCache:
+    """Parsed dataframes stored as Arrow IPC files keyed by (blob SHA, sheet name).
+
+    Reopening a workbook memory-maps the columnar file instead of re-running
+    openpyxl. Storage and LRU eviction reuse BlobCache under its own directory.
+    """
+
+    def __init__(self, store: Optional[BlobCache] = None):
+        self.store = store if store is not None else BlobCache(FRAME_CACHE_DIR, FRAME_CACHE_MAX_BYTES)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(blob_sha: str, sheet_name: Optional[str]) -> str:
+        return hashlib.sha1(f"{blob_sha}\0{sheet_name or ''}".encode("utf-8")).hexdigest()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Tuple[int, int]:
+        with self._lock:
+            return self.hits, self.misses
+
+    def get(self, blob_sha: Optional[str], sheet_name: Optional[str] = None):
+        if pa is None or not blob_sha:
+            return None
+        path = self.store.path_for(self._key(blob_sha, sheet_name))
+        if path is None:
+            self._count(False)
+            return None
+        try:
+            with pa.memory_map(path, "r") as source:
+                df = pa.ipc.open_file(source).read_all().to_pandas()
+        except Exception:
+            self._count(False)
+            return None
+        self._count(True)
+        return df
+
+    def put(self, blob_sha: Optional[str], sheet_name: Optional[str], df) -> bool:
+        if pa is None or not blob_sha or df is None:
+            return False
+        # Arrow stores labels as strings (an Excel year header 2019 would come back as '2019'),
+        # so a hit would differ from a fresh parse; only frames with str labels round-trip.
+        if not all(isinstance(label, str) for label in df.columns):
+            return False
+        try:
+            table = pa.Table.from_pandas(df)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            data = sink.getvalue().to_pybytes()
+        except Exception:
+            # Mixed-type object columns (common in hand-edited sheets) don't convert; just skip them.
+            return False
+        return self.store.put(self._key(blob_sha, sheet_name), data)
+
+
+_shared_cache: Optional[FrameSidecarCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_frame_cache() -> FrameSidecarCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FrameSidecarCache()
+        return _shared_cache
@@ -1,20 +1,37 @@
 import base64
+import hashlib
+import random
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Optional, Tuple
 from urllib.parse import quote
 
 import requests
 import streamlit as st
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.util.retry import Retry
 
+from blob_cache import BlobCache, get_blob_cache
+
 DEFAULT_REPO = "Chakrapani2122/Regen-Ag-Data"
+ETAG_CACHE_MAX_ENTRIES = 256
+ETAG_CACHE_MAX_BODY_BYTES = 2 * 1024 * 1024
+# Total stored bodies per client (one client per token); least recently used entries go first.
+ETAG_CACHE_MAX_TOTAL_BYTES = 32 * 1024 * 1024
+RAW_STREAM_CHUNK_BYTES = 1024 * 1024
+RATE_LIMIT_MAX_ATTEMPTS = 4
+RATE_LIMIT_MAX_WAIT = 60
+CATALOG_COMMIT_MAX_ATTEMPTS = 6
 
 
 class GitHubClient:
-    def __init__(self, token: str, repo: str = DEFAULT_REPO):
+    def __init__(self, token: str, repo: str = DEFAULT_REPO, blob_cache: Optional[BlobCache] = None):
         self.token = token
         self.repo = repo
+        self.blob_cache = blob_cache if blob_cache is not None else get_blob_cache()
         self.api_base = f"https://api.github.com/repos/{repo}"
         self.session = requests.Session()
 
@@ -28,6 +45,12 @@ class GitHubClient:
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
+        # Validators and bodies of recent GETs, revalidated with If-None-Match /
+        # If-Modified-Since. GitHub doesn't count 304 replies against the rate limit.
+        self._etag_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._etag_bytes = 0
+        self._etag_lock = threading.Lock()
+
     def _headers(self, accept: Optional[str] = None) -> Dict[str, str]:
         headers = {"Authorization": f"token {self.token}"}
         if accept:
@@ -44,22 +67,80 @@ class GitHubClient:
         **kwargs: Any,
     ) -> Tuple[Optional[requests.Response], Optional[str], bool]:
         url = f"{self.api_base}{endpoint}"
+        headers = self._headers(accept=accept)
+        cache_key = None
+        cached = None
+        if method == "GET" and not kwargs.get("stream"):
+            params = kwargs.get("params") or {}
+            cache_key = (url, accept, tuple(sorted(params.items())))
+            with self._etag_lock:
+                cached = self._etag_cache.get(cache_key)
+                if cached is not None:
+                    self._etag_cache.move_to_end(cache_key)
+            if cached is not None:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
         try:
             response = self.session.request(
                 method,
                 url,
-                headers=self._headers(accept=accept),
+                headers=headers,
                 timeout=timeout,
                 **kwargs,
             )
         except requests.RequestException as exc:
             return None, f"Network error: {exc}", False
 
+        if response.status_code == 304 and cached is not None:
+            return self._cached_response(url, cached), None, False
+
         if response.status_code in (401, 403):
             return response, "Authentication failed or token access denied.", True
 
+        if cache_key is not None and response.status_code == 200:
+            self._remember_response(cache_key, response)
+
         return response, None, False
 
+    def _remember_response(self, cache_key: tuple, response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        body = response.content
+        if len(body) > ETAG_CACHE_MAX_BODY_BYTES:
+            return
+
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content": body,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        with self._etag_lock:
+            previous = self._etag_cache.pop(cache_key, None)
+            if previous is not None:
+                self._etag_bytes -= len(previous["content"])
+            self._etag_cache[cache_key] = entry
+            self._etag_bytes += len(body)
+            while len(self._etag_cache) > ETAG_CACHE_MAX_ENTRIES or self._etag_bytes > ETAG_CACHE_MAX_TOTAL_BYTES:
+                _, evicted = self._etag_cache.popitem(last=False)
+                self._etag_bytes -= len(evicted["content"])
+
+    @staticmethod
+    def _cached_response(url: str, entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = entry["content"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        return response
+
     def validate_token(self) -> bool:
         response, _, auth_error = self._request("GET", "", timeout=20)
         return bool(response is not None and response.status_code == 200 and not auth_error)
@@ -78,6 +159,29 @@ class GitHubClient:
         except ValueError:
             return None, "Invalid JSON returned by GitHub.", False
 
+    def get_head_sha(self, ref: str = "HEAD") -> Tuple[Optional[str], Optional[str], bool]:
+        endpoint = f"/commits/{quote(ref, safe='')}"
+        response, error, auth_error = self._request("GET", endpoint, accept="application/vnd.github.sha", timeout=20)
+        if response is None:
+            return None, error, auth_error
+        if response.status_code != 200:
+            return None, f"GitHub returned status {response.status_code} for {endpoint}.", auth_error
+        return response.text.strip(), None, False
+
+    def get_tree(self, tree_sha: str, recursive: bool = True) -> Tuple[Optional[dict], Optional[str], bool]:
+        endpoint = f"/git/trees/{tree_sha}"
+        params = {"recursive": "1"} if recursive else None
+        response, error, auth_error = self._request("GET", endpoint, params=params, timeout=60)
+        if response is None:
+            return None, error, auth_error
+        if response.status_code != 200:
+            return None, f"GitHub returned status {response.status_code} for {endpoint}.", auth_error
+
+        try:
+            return response.json(), None, False
+        except ValueError:
+            return None, "Invalid JSON returned by GitHub trees endpoint.", False
+
     def get_file_metadata(self, file_path: str) -> Tuple[Optional[dict], Optional[str], bool]:
         encoded_file_path = quote(file_path, safe='/')
         endpoint = f"/contents/{encoded_file_path}"
@@ -92,7 +196,78 @@ class GitHubClient:
         except ValueError:
             return None, "Invalid JSON returned by GitHub metadata endpoint.", False
 
-    def get_file_content(self, file_path: str) -> Tuple[Optional[bytes], Optional[str], bool, Optional[dict]]:
+    def get_file_content(
+        self,
+        file_path: str,
+        sha: Optional[str] = None,
+        raw_first: bool = True,
+    ) -> Tuple[Optional[bytes], Optional[str], bool, Optional[dict]]:
+        # A known blob SHA lets us serve cached bytes without touching the network.
+        if sha:
+            cached = self.blob_cache.get(sha)
+            if cached is not None:
+                return cached, None, False, {"path": file_path, "sha": sha, "size": len(cached)}
+
+        content, error, auth_error, metadata = None, None, False, None
+        if raw_first:
+            content, error, auth_error, metadata = self._fetch_raw_content(file_path, sha=sha)
+        if content is None and not auth_error and (metadata is None or metadata.get("status") != 404):
+            content, error, auth_error, metadata = self._fetch_file_content(file_path)
+
+        if content is not None:
+            # The contents-API fallback reads metadata and bytes in two requests; key by the bytes.
+            metadata = {**(metadata or {}), "sha": self.git_blob_sha(content)}
+            self.blob_cache.put(metadata["sha"], content)
+        return content, error, auth_error, metadata
+
+    @staticmethod
+    def git_blob_sha(content: bytes) -> str:
+        digest = hashlib.sha1(f"blob {len(content)}\0".encode("ascii"))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _fetch_raw_content(
+        self,
+        file_path: str,
+        sha: Optional[str] = None,
+    ) -> Tuple[Optional[bytes], Optional[str], bool, Optional[dict]]:
+        """Stream the file body via the raw media type, skipping the base64 metadata call.
+
+        The blob SHA is computed from the bytes exactly as git would, so no
+        metadata request is needed; the sha argument is not trusted for this.
+        """
+        encoded_file_path = quote(file_path, safe='/')
+        endpoint = f"/contents/{encoded_file_path}"
+        response, error, auth_error = self._request(
+            "GET",
+            endpoint,
+            accept="application/vnd.github.raw",
+            timeout=60,
+            stream=True,
+        )
+        if response is None:
+            return None, error, auth_error, None
+
+        try:
+            if response.status_code != 200:
+                metadata = {"path": file_path, "status": response.status_code}
+                return None, f"GitHub raw content request returned status {response.status_code}.", auth_error, metadata
+
+            buffer = bytearray()
+            for chunk in response.iter_content(chunk_size=RAW_STREAM_CHUNK_BYTES):
+                if chunk:
+                    buffer.extend(chunk)
+            content = bytes(buffer)
+        except requests.RequestException as exc:
+            return None, f"Raw content stream failed: {exc}", False, None
+        finally:
+            response.close()
+
+        # Hash what actually came back: a stale caller SHA (e.g. from a tree index a few
+        # seconds old) must never become the cache key for newer content.
+        return content, None, False, {"path": file_path, "sha": self.git_blob_sha(content), "size": len(content)}
+
+    def _fetch_file_content(self, file_path: str) -> Tuple[Optional[bytes], Optional[str], bool, Optional[dict]]:
         metadata, error, auth_error = self.get_file_metadata(file_path)
         if metadata is None:
             return None, error, auth_error, None
@@ -103,6 +278,11 @@ class GitHubClient:
             except Exception as exc:
                 return None, f"Failed to decode base64 content: {exc}", False, metadata
 
+        # Large files come back without inline content; skip the download if we already hold the blob.
+        cached = self.blob_cache.get(metadata.get("sha"))
+        if cached is not None:
+            return cached, None, False, metadata
+
         download_url = metadata.get("download_url")
         if download_url:
             try:
@@ -164,6 +344,301 @@ class GitHubClient:
             return {}, None, False
 
 
+    @staticmethod
+    def _is_rate_limited(response: requests.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if response.headers.get("Retry-After") or response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "rate limit" in response.text.lower()
+
+    def _request_with_backoff(
+        self,
+        method: str,
+        endpoint: str,
+        **kwargs: Any,
+    ) -> Tuple[Optional[requests.Response], Optional[str], bool]:
+        """Like _request, but waits out primary/secondary rate-limit replies instead of reporting an auth failure."""
+        for attempt in range(RATE_LIMIT_MAX_ATTEMPTS):
+            response, error, auth_error = self._request(method, endpoint, **kwargs)
+            if response is None or not self._is_rate_limited(response):
+                return response, error, auth_error
+            if attempt == RATE_LIMIT_MAX_ATTEMPTS - 1:
+                break
+            try:
+                wait = float(response.headers.get("Retry-After", 0)) or 2 ** (attempt + 1)
+            except ValueError:
+                wait = 2 ** (attempt + 1)
+            time.sleep(min(wait, RATE_LIMIT_MAX_WAIT))
+        return response, "GitHub rate limit reached; please try again shortly.", False
+
+    def get_default_branch(self) -> Tuple[Optional[str], Optional[str], bool]:
+        response, error, auth_error = self._request("GET", "", timeout=20)
+        if response is None:
+            return None, error, auth_error
+        if response.status_code != 200:
+            return None, f"GitHub returned status {response.status_code} for repository info.", auth_error
+
+        try:
+            return response.json().get("default_branch") or "main", None, False
+        except ValueError:
+            return None, "Invalid JSON returned by GitHub repository endpoint.", False
+
+    def create_blob(self, content: bytes) -> Tuple[Optional[str], Optional[str], bool]:
+        payload = {"content": base64.b64encode(content).decode("utf-8"), "encoding": "base64"}
+        response, error, auth_error = self._request_with_backoff("POST", "/git/blobs", json=payload, timeout=120)
+        if response is None:
+            return None, error, auth_error
+        if response.status_code != 201:
+            return None, error or f"GitHub returned status {response.status_code} while creating a blob.", auth_error
+
+        try:
+            blob_sha = response.json()["sha"]
+        except (ValueError, KeyError):
+            return None, "Invalid JSON returned by GitHub blobs endpoint.", False
+        self.blob_cache.put(blob_sha, content)
+        return blob_sha, None, False
+
+    def _json_request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[dict],
+        expected: Tuple[int, ...],
+    ) -> Tuple[Optional[dict], Optional[str], bool, Optional[int]]:
+        response, error, auth_error = self._request_with_backoff(method, endpoint, json=payload, timeout=60)
+        if response is None:
+            return None, error, auth_error, None
+        if response.status_code not in expected:
+            return None, error or f"GitHub returned status {response.status_code} for {endpoint}.", auth_error, response.status_code
+        try:
+            return response.json(), None, False, response.status_code
+        except ValueError:
+            return None, f"Invalid JSON returned by GitHub for {endpoint}.", False, response.status_code
+
+    def get_file_at_ref(self, file_path: str, ref: str) -> Tuple[Optional[bytes], Optional[str], bool, bool]:
+        """File bytes as of ref (a commit SHA or branch). Returns (content, error, auth_error, missing)."""
+        encoded_file_path = quote(file_path, safe='/')
+        endpoint = f"/contents/{encoded_file_path}"
+        response, error, auth_error = self._request(
+            "GET", endpoint, accept="application/vnd.github.raw", params={"ref": ref}, timeout=60
+        )
+        if response is None:
+            return None, error, auth_error, False
+        if response.status_code == 404:
+            return None, None, False, True
+        if response.status_code != 200:
+            return None, f"GitHub returned status {response.status_code} for {file_path}.", auth_error, False
+        content = response.content
+        self.blob_cache.put(self.git_blob_sha(content), content)
+        return content, None, False, False
+
+    def _create_blobs(
+        self,
+        files: Dict[str, bytes],
+        max_workers: int,
+        on_progress: Optional[Callable[[str, Optional[str]], None]],
+    ) -> Tuple[Optional[Dict[str, str]], Optional[str], bool]:
+        blob_shas: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(self.create_blob, content): path for path, content in files.items()}
+            for future in as_completed(futures):
+                path = futures[future]
+                blob_sha, error, auth_error = future.result()
+                if on_progress is not None:
+                    on_progress(path, error)
+                if blob_sha is None:
+                    for pending in futures:
+                        pending.cancel()
+                    return None, f"{path}: {error}", auth_error
+                blob_shas[path] = blob_sha
+        return blob_shas, None, False
+
+    def _existing_paths(self, root_tree_sha: str, paths) -> Tuple[Optional[set], Optional[str], bool]:
+        """Which of paths exist in the tree root_tree_sha, walking only the folders on those paths."""
+        listings: Dict[str, Dict[str, dict]] = {}
+        existing = set()
+        for path in paths:
+            parts = path.strip("/").split("/")
+            tree_sha = root_tree_sha
+            for depth, part in enumerate(parts):
+                entries = listings.get(tree_sha)
+                if entries is None:
+                    tree, error, auth_error = self.get_tree(tree_sha, recursive=False)
+                    if tree is None:
+                        return None, error, auth_error
+                    entries = {entry.get("path"): entry for entry in tree.get("tree", [])}
+                    listings[tree_sha] = entries
+                entry = entries.get(part)
+                if entry is None:
+                    break
+                if depth == len(parts) - 1:
+                    existing.add(path)
+                elif entry.get("type") != "tree":
+                    break
+                else:
+                    tree_sha = entry["sha"]
+        return existing, None, False
+
+    def _commit_blobs(
+        self,
+        blob_shas: Dict[str, str],
+        message: str,
+        branch: str,
+        max_attempts: int,
+        on_head: Optional[Callable[[str], Tuple[Optional[Dict[str, str]], Optional[str], bool]]] = None,
+        create_only: bool = False,
+    ) -> Tuple[Optional[dict], Optional[str], bool]:
+        """Build a tree and commit on the branch head, moving the ref without force.
+
+        on_head(head_sha) may return extra path -> blob SHA entries derived from
+        the head being committed on; it is called again whenever the branch moved
+        and the commit has to be rebuilt. With create_only, the commit is refused
+        if any of blob_shas' paths already exists in that head's tree.
+        """
+        ref_endpoint = f"/git/refs/heads/{quote(branch, safe='/')}"
+        for attempt in range(max(1, max_attempts)):
+            if attempt:
+                # Spread out writers that keep colliding on the same head.
+                time.sleep(random.uniform(0, 0.25 * 2 ** min(attempt, 4)))
+            ref, error, auth_error, _ = self._json_request("GET", ref_endpoint, None, (200,))
+            if ref is None:
+                return None, error, auth_error
+            head_sha = ref["object"]["sha"]
+
+            head_commit, error, auth_error, _ = self._json_request("GET", f"/git/commits/{head_sha}", None, (200,))
+            if head_commit is None:
+                return None, error, auth_error
+
+            if create_only:
+                existing, error, auth_error = self._existing_paths(head_commit["tree"]["sha"], blob_shas)
+                if existing is None:
+                    return None, error, auth_error
+                if existing:
+                    return None, f"Already exists in the repository: {', '.join(sorted(existing))}.", False
+
+            entries = dict(blob_shas)
+            if on_head is not None:
+                extra, error, auth_error = on_head(head_sha)
+                if extra is None:
+                    return None, error, auth_error
+                entries.update(extra)
+
+            tree_entries = [
+                {"path": path, "mode": "100644", "type": "blob", "sha": blob_sha}
+                for path, blob_sha in sorted(entries.items())
+            ]
+            tree, error, auth_error, _ = self._json_request(
+                "POST", "/git/trees", {"base_tree": head_commit["tree"]["sha"], "tree": tree_entries}, (201,)
+            )
+            if tree is None:
+                return None, error, auth_error
+
+            commit, error, auth_error, _ = self._json_request(
+                "POST", "/git/commits", {"message": message, "tree": tree["sha"], "parents": [head_sha]}, (201,)
+            )
+            if commit is None:
+                return None, error, auth_error
+
+            updated, error, auth_error, status = self._json_request(
+                "PATCH", ref_endpoint, {"sha": commit["sha"], "force": False}, (200,)
+            )
+            if updated is not None:
+                return commit, None, False
+            # 409/422 mean the branch moved since we read it; rebuild on the new head.
+            if status not in (409, 422):
+                return None, error, auth_error
+
+        return None, "The branch kept moving while committing; please retry the upload.", False
+
+    def commit_files(
+        self,
+        files: Dict[str, bytes],
+        message: str,
+        branch: Optional[str] = None,
+        max_workers: int = 4,
+        on_progress: Optional[Callable[[str, Optional[str]], None]] = None,
+        max_attempts: int = 3,
+        create_only: bool = False,
+    ) -> Tuple[Optional[dict], Optional[str], bool]:
+        """Commit every path -> bytes in files as a single git commit via the git data API.
+
+        Blobs are created concurrently on the shared session; on_progress(path, error)
+        is called from the calling thread as each one finishes. The branch ref is only
+        moved once every blob and the tree exist, so a batch lands entirely or not at
+        all. If the branch moves underneath us the tree/commit is rebuilt on the new head.
+        With create_only, nothing is committed if any path already exists on that head
+        (checked against the head itself, not a possibly stale tree index).
+        """
+        if not files:
+            return None, "No files to commit.", False
+
+        if branch is None:
+            branch, error, auth_error = self.get_default_branch()
+            if branch is None:
+                return None, error, auth_error
+
+        blob_shas, error, auth_error = self._create_blobs(files, max_workers, on_progress)
+        if blob_shas is None:
+            return None, error, auth_error
+        return self._commit_blobs(blob_shas, message, branch, max_attempts, create_only=create_only)
+
+    def commit_catalog_update(
+        self,
+        files: Dict[str, bytes],
+        catalog_path: str,
+        apply_update: Callable[[Optional[bytes]], bytes],
+        message: str,
+        branch: Optional[str] = None,
+        max_workers: int = 4,
+        max_attempts: int = CATALOG_COMMIT_MAX_ATTEMPTS,
+    ) -> Tuple[Optional[dict], Optional[str], bool]:
+        """Commit files together with an edit of catalog_path, atomically and without lost updates.
+
+        apply_update(current_bytes) returns the new catalog bytes (current_bytes
+        is None when the catalog doesn't exist yet). The catalog is read at the
+        exact head being committed on, and the ref only moves if that head is
+        still current, so when another writer gets in first the catalog is
+        re-read from their commit and the update re-applied. Nothing is
+        committed if any path in files already exists on the head.
+        """
+        if branch is None:
+            branch, error, auth_error = self.get_default_branch()
+            if branch is None:
+                return None, error, auth_error
+
+        blob_shas: Dict[str, str] = {}
+        if files:
+            blob_shas, error, auth_error = self._create_blobs(files, max_workers, None)
+            if blob_shas is None:
+                return None, error, auth_error
+
+        def _catalog_at(head_sha: str) -> Tuple[Optional[Dict[str, str]], Optional[str], bool]:
+            # Never replace an existing file (e.g. two people publishing under the same name).
+            for path in sorted(files):
+                existing, error, auth_error, missing = self.get_file_at_ref(path, head_sha)
+                if existing is None and not missing:
+                    return None, error, auth_error
+                if not missing:
+                    return None, f"{path} already exists; please choose a different name.", False
+
+            current, error, auth_error, missing = self.get_file_at_ref(catalog_path, head_sha)
+            if current is None and not missing:
+                return None, error, auth_error
+            try:
+                updated = apply_update(current)
+            except Exception as exc:
+                return None, f"Could not update {catalog_path}: {exc}", False
+            catalog_sha, error, auth_error = self.create_blob(updated)
+            if catalog_sha is None:
+                return None, error, auth_error
+            return {catalog_path: catalog_sha}, None, False
+
+        return self._commit_blobs(blob_shas, message, branch, max_attempts, on_head=_catalog_at)
+
+
 @st.cache_resource(show_spinner=False)
 def get_github_client(token: str, repo: str = DEFAULT_REPO) -> GitHubClient:
     # Tiny sleep helps reduce rapid duplicate session creation on very fast reruns.
@@ -0,0 +1,99 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Points per horizontal pixel kept by min/max decimation (one min and one max per pixel column).
+LINE_POINTS_PER_PIXEL = 2
+# Scatter switches to hexbin/sampling above this many points per on-screen pixel.
+SCATTER_POINTS_PER_PIXEL = 0.1
+SCATTER_SAMPLE_POINTS_PER_PIXEL = 0.05
+HEXBIN_PIXELS_PER_CELL = 8
+BAR_PIXELS_PER_BAR = 4
+
+
+def axes_pixel_size(ax) -> Tuple[int, int]:
+    """Width and height of ax in device pixels at the figure's dpi."""
+    bbox = ax.get_window_extent()
+    return max(int(bbox.width), 1), max(int(bbox.height), 1)
+
+
+def is_numeric_axis(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def minmax_indices(values: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Row positions keeping the min and max of each of n_buckets equal row ranges, plus the endpoints.
+
+    Spikes survive (unlike striding), and the result is in row order, so x
+    can be anything matplotlib accepts.
+    """
+    n_rows = len(values)
+    if n_buckets <= 0 or n_rows <= 2 * n_buckets:
+        return np.arange(n_rows)
+    size = int(np.ceil(n_rows / n_buckets))
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n_rows] = values
+    blocks = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1)
+    keep = np.unique(np.concatenate([[0, n_rows - 1], lows, highs]))
+    return keep[keep < n_rows]
+
+
+def sample_indices(n_rows: int, n_keep: int, seed: int = 0) -> np.ndarray:
+    """Sorted uniform random row positions; deterministic so cached and fresh renders agree."""
+    if n_rows <= n_keep:
+        return np.arange(n_rows)
+    return np.sort(np.random.default_rng(seed).choice(n_rows, n_keep, replace=False))
+
+
+def line_buckets(width_px: int) -> int:
+    # Each bucket contributes a min and a max point.
+    return max(1, width_px * LINE_POINTS_PER_PIXEL // 2)
+
+
+def scatter_limits(width_px: int, height_px: int) -> Tuple[int, int]:
+    """(max points drawn as markers, sample size when a sample is used instead of hexbin)."""
+    area = width_px * height_px
+    return int(area * SCATTER_POINTS_PER_PIXEL), int(area * SCATTER_SAMPLE_POINTS_PER_PIXEL)
+
+
+def hexbin_gridsize(width_px: int) -> int:
+    return max(10, width_px // HEXBIN_PIXELS_PER_CELL)
+
+
+def max_bars(width_px: int) -> int:
+    return max(10, width_px // BAR_PIXELS_PER_BAR)
+
+
+def bin_bars(df: pd.DataFrame, x_col, y_cols: List, n_bars: int) -> Tuple[pd.DataFrame, Optional[float], str]:
+    """Aggregate rows into at most n_bars bars, taking the mean of each y column per bar.
+
+    Numeric and datetime x are cut into equal-width bins (returning the bar
+    width in x units); other x values are grouped by value, keeping the
+    n_bars most frequent. Returns (frame indexed by bar position, width, label).
+    """
+    subset = df[[x_col] + [col for col in y_cols if col != x_col]]
+    x_values = subset[x_col]
+    if is_numeric_axis(x_values) or pd.api.types.is_datetime64_any_dtype(x_values):
+        bins = pd.cut(x_values, n_bars)
+        grouped = subset[y_cols].groupby(bins, observed=True).mean()
+        centers = [interval.mid for interval in grouped.index]
+        width = None
+        if len(grouped):
+            width = (grouped.index[0].right - grouped.index[0].left) * 0.9
+            if pd.api.types.is_datetime64_any_dtype(x_values):
+                # Matplotlib date units are days.
+                width = width / pd.Timedelta(days=1)
+        grouped.index = pd.Index(centers)
+        return grouped, width, f"mean per x-bin ({len(grouped):,} bins of {len(df):,} rows)"
+
+    counts = x_values.value_counts()
+    top = counts.index[:n_bars]
+    grouped = subset[subset[x_col].isin(top)].groupby(x_col, sort=False)[y_cols].mean()
+    label = f"mean per {x_col}"
+    if len(counts) > n_bars:
+        label += f" ({n_bars} most frequent of {len(counts):,} values)"
+    return grouped, None, label
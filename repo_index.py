@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+TREE_INDEX_CHECK_INTERVAL = 30  # seconds between branch-head checks per token
+
+
+class RepoTreeIndex:
+    """In-memory folder/file index built from one recursive git-trees response."""
+
+    def __init__(self, head_sha: str, tree: dict):
+        self.head_sha = head_sha
+        self.truncated = bool(tree.get("truncated"))
+        self._folders: Dict[str, List[str]] = {"": []}
+        self._files: Dict[str, List[str]] = {"": []}
+        self._blobs: Dict[str, dict] = {}
+
+        for entry in tree.get("tree", []):
+            path = entry.get("path")
+            if not path:
+                continue
+            parent, _, name = path.rpartition("/")
+            if entry.get("type") == "tree":
+                self._folders.setdefault(parent, []).append(name)
+                self._folders.setdefault(path, [])
+                self._files.setdefault(path, [])
+            elif entry.get("type") == "blob":
+                self._files.setdefault(parent, []).append(name)
+                self._blobs[path] = {"sha": entry.get("sha"), "size": entry.get("size")}
+
+        for names in self._folders.values():
+            names.sort()
+        for names in self._files.values():
+            names.sort()
+
+    def list_dir(self, path: str = "") -> Optional[Tuple[List[str], List[str]]]:
+        """Return (folders, files) under path, or None when the index can't answer."""
+        path = path.strip("/")
+        if path not in self._folders:
+            return None
+        # A truncated tree may be missing children of any folder, so defer to the API.
+        if self.truncated:
+            return None
+        return list(self._folders[path]), list(self._files.get(path, []))
+
+    def blob_sha(self, file_path: str) -> Optional[str]:
+        blob = self._blobs.get(file_path.strip("/"))
+        return blob.get("sha") if blob else None
+
+    def blob_size(self, file_path: str) -> Optional[int]:
+        blob = self._blobs.get(file_path.strip("/"))
+        return blob.get("size") if blob else None
+
+
+_indexes: Dict[str, RepoTreeIndex] = {}
+_last_checked: Dict[Tuple[str, str], float] = {}
+_lock = threading.Lock()
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_repo_tree_index(client) -> Tuple[Optional[RepoTreeIndex], Optional[str], bool]:
+    """Return the shared tree index for client.repo, rebuilding it only when the branch head moves.
+
+    The index is shared by every session on the same repository; each token still
+    confirms the head SHA itself (at most once per TREE_INDEX_CHECK_INTERVAL) so
+    a revoked token stops seeing listings.
+    """
+    check_key = (client.repo, _token_key(client.token))
+    now = time.monotonic()
+    with _lock:
+        index = _indexes.get(client.repo)
+        last_checked = _last_checked.get(check_key, 0.0)
+    if index is not None and now - last_checked < TREE_INDEX_CHECK_INTERVAL:
+        return index, None, False
+
+    head_sha, error, auth_error = client.get_head_sha()
+    if head_sha is None:
+        return None, error, auth_error
+
+    if index is None or index.head_sha != head_sha:
+        tree, error, auth_error = client.get_tree(head_sha, recursive=True)
+        if tree is None:
+            return None, error, auth_error
+        index = RepoTreeIndex(head_sha, tree)
+
+    with _lock:
+        _indexes[client.repo] = index
+        _last_checked[check_key] = now
+    return index, None, False
+
+
+def invalidate_tree_index(repo: str) -> None:
+    """Force the next lookup for repo to re-check the branch head (e.g. right after a commit)."""
+    with _lock:
+        for key in [k for k in _last_checked if k[0] == repo]:
+            del _last_checked[key]
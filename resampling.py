@@ -0,0 +1,176 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+RESAMPLE_DEFAULT_COUNT = 10_000
+RESAMPLE_JOB_SIZE = 1_000
+RESAMPLE_BATCH_ELEMENTS = 2_000_000
+RESAMPLE_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _mean_diff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a.mean(axis=1) - b.mean(axis=1)
+
+
+def _cohen_d(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n_a, n_b = a.shape[1], b.shape[1]
+    pooled_var = ((n_a - 1) * a.var(axis=1, ddof=1) + (n_b - 1) * b.var(axis=1, ddof=1)) / (n_a + n_b - 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(pooled_var > 0, _mean_diff(a, b) / np.sqrt(pooled_var), np.nan)
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    x_centered = x - x.mean(axis=1, keepdims=True)
+    y_centered = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (x_centered * y_centered).sum(axis=1) / np.sqrt(
+            (x_centered ** 2).sum(axis=1) * (y_centered ** 2).sum(axis=1)
+        )
+
+
+# Row-wise statistics: each takes two (resamples, n) arrays and returns one value per row.
+STATISTICS = {
+    "mean_diff": _mean_diff,
+    "cohen_d": _cohen_d,
+    "pearson": _pearson,
+}
+
+
+def _resample_job(args):
+    """Compute statistics for one block of resamples; runs in a worker process.
+
+    Resamples are generated in batches of at most RESAMPLE_BATCH_ELEMENTS
+    values so memory stays bounded whatever the sample size.
+    """
+    job_index, method, statistics, sample_a, sample_b, paired, count, seed = args
+    rng = np.random.default_rng(seed)
+    n_a, n_b = len(sample_a), len(sample_b)
+    width = n_a if paired else n_a + n_b
+    batch = max(1, RESAMPLE_BATCH_ELEMENTS // max(width, 1))
+    pooled = None if paired else np.concatenate([sample_a, sample_b])
+    out = {name: np.empty(count) for name in statistics}
+
+    for start in range(0, count, batch):
+        size = min(batch, count - start)
+        if paired and method == "bootstrap":
+            rows = rng.integers(0, n_a, size=(size, n_a))
+            block_a, block_b = sample_a[rows], sample_b[rows]
+        elif paired:
+            # Permuting y against a fixed x breaks the pairing under the null.
+            block_a = np.broadcast_to(sample_a, (size, n_a))
+            block_b = rng.permuted(np.tile(sample_b, (size, 1)), axis=1)
+        elif method == "bootstrap":
+            block_a = sample_a[rng.integers(0, n_a, size=(size, n_a))]
+            block_b = sample_b[rng.integers(0, n_b, size=(size, n_b))]
+        else:
+            shuffled = rng.permuted(np.tile(pooled, (size, 1)), axis=1)
+            block_a, block_b = shuffled[:, :n_a], shuffled[:, n_a:]
+        for name in statistics:
+            out[name][start:start + size] = STATISTICS[name](block_a, block_b)
+    return job_index, out
+
+
+def _build_jobs(methods, statistics, sample_a, sample_b, paired, n_resamples, seed):
+    # Fixed-size jobs with spawned seeds make results independent of worker count and completion order.
+    starts = list(range(0, n_resamples, RESAMPLE_JOB_SIZE))
+    seeds = np.random.SeedSequence(seed).spawn(len(methods) * len(starts))
+    jobs = []
+    for method in methods:
+        for start in starts:
+            job_index = len(jobs)
+            count = min(RESAMPLE_JOB_SIZE, n_resamples - start)
+            jobs.append((job_index, method, tuple(statistics), sample_a, sample_b, paired, count, seeds[job_index]))
+    return jobs
+
+
+def _execute(jobs, on_progress, should_cancel):
+    """Run jobs on a process pool (serially if the pool is unavailable); None when cancelled."""
+    results = [None] * len(jobs)
+    done = 0
+
+    def _record(job_index, out):
+        nonlocal done
+        results[job_index] = out
+        done += 1
+        if on_progress is not None:
+            on_progress(done, len(jobs))
+
+    executor = None
+    if len(jobs) > 1 and RESAMPLE_MAX_WORKERS > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=RESAMPLE_MAX_WORKERS)
+            futures = [executor.submit(_resample_job, job) for job in jobs]
+        except Exception:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            executor = None
+
+    if executor is None:
+        for job in jobs:
+            if should_cancel is not None and should_cancel():
+                return None
+            _record(*_resample_job(job))
+        return results
+
+    try:
+        for future in as_completed(futures):
+            if should_cancel is not None and should_cancel():
+                return None
+            _record(*future.result())
+    finally:
+        # Also reached when Streamlit interrupts the script (rerun/stop), so queued jobs are dropped.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def run_resampling(
+    sample_a,
+    sample_b,
+    statistics: Sequence[str],
+    n_resamples: int = RESAMPLE_DEFAULT_COUNT,
+    methods: Sequence[str] = ("bootstrap", "permutation"),
+    paired: bool = False,
+    seed: int = 0,
+    alpha: float = 0.05,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Optional[dict]:
+    """Bootstrap percentile CIs and two-sided permutation p-values for the given statistics.
+
+    Two-sample statistics (mean_diff, cohen_d) resample each group
+    independently for the bootstrap and shuffle group labels for the
+    permutation test; paired statistics (pearson) resample rows and permute
+    one column against the other. Returns {statistic: {"observed",
+    "ci_low", "ci_high", "p_value"}}, or None if should_cancel() fired.
+    """
+    sample_a = np.asarray(sample_a, dtype=float)
+    sample_b = np.asarray(sample_b, dtype=float)
+    jobs = _build_jobs(methods, statistics, sample_a, sample_b, paired, int(n_resamples), seed)
+    results = _execute(jobs, on_progress, should_cancel)
+    if results is None:
+        return None
+
+    summary = {}
+    for name in statistics:
+        observed = float(STATISTICS[name](sample_a[None, :], sample_b[None, :])[0])
+        entry = {"observed": observed, "ci_low": np.nan, "ci_high": np.nan, "p_value": np.nan}
+        by_method = {
+            method: np.concatenate([out[name] for job, out in zip(jobs, results) if job[1] == method])
+            for method in methods
+        }
+        boot = by_method.get("bootstrap")
+        if boot is not None:
+            boot = boot[~np.isnan(boot)]
+            if boot.size:
+                ci_low, ci_high = np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+                entry["ci_low"], entry["ci_high"] = float(ci_low), float(ci_high)
+        perm = by_method.get("permutation")
+        if perm is not None and not np.isnan(observed):
+            perm = perm[~np.isnan(perm)]
+            # Small tolerance so ties with the observed value count as "at least as extreme".
+            extreme = np.abs(perm) >= abs(observed) * (1 - 1e-12)
+            entry["p_value"] = (int(extreme.sum()) + 1) / (perm.size + 1)
+        summary[name] = entry
+    return summary
@@ -0,0 +1,498 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import stats
+except Exception:
+    stats = None
+
+BATCH_TESTS = [
+    "Pearson Correlation",
+    "Welch T-Test",
+    "Mann-Whitney U",
+    "One-way ANOVA",
+    "Chi-Square",
+    "Normality",
+]
+CORRECTIONS = {
+    "Benjamini-Hochberg (FDR)": "fdr_bh",
+    "Bonferroni": "bonferroni",
+    "None": None,
+}
+BATCH_MAX_GROUPS = 200
+POSTHOC_MAX_GROUPS = 50
+PROCESS_POOL_MIN_TASKS = 16
+PROCESS_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+SHAPIRO_MAX_ROWS = 5000
+NORMALITY_COLUMN_BLOCK = 8
+DAGOSTINO_MIN_ROWS = 20
+
+RESULT_COLUMNS = ["Test", "Variable", "Against", "n", "Statistic", "P-value"]
+
+
+def adjust_pvalues(p_values, method: Optional[str] = "fdr_bh") -> np.ndarray:
+    """Multiple-comparison adjustment (Benjamini-Hochberg or Bonferroni); NaNs are left out."""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = ~np.isnan(p_values)
+    m = int(valid.sum())
+    if m == 0:
+        return adjusted
+    if method is None:
+        adjusted[valid] = p_values[valid]
+    elif method == "bonferroni":
+        adjusted[valid] = np.minimum(p_values[valid] * m, 1.0)
+    else:
+        ordered_idx = np.argsort(p_values[valid])
+        ranked = p_values[valid][ordered_idx] * m / np.arange(1, m + 1)
+        ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+        bh = np.empty(m)
+        bh[ordered_idx] = np.minimum(ranked, 1.0)
+        adjusted[valid] = bh
+    return adjusted
+
+
+def grouped_moments(df: pd.DataFrame, group_col, value_cols: List) -> dict:
+    """Per-group count, mean and sum of squared deviations for every value column in one groupby pass.
+
+    Returns arrays shaped (groups, value columns) plus the group labels in
+    order of first appearance. Missing values are skipped per column.
+    """
+    subset = df[[group_col] + list(value_cols)]
+    subset = subset[subset[group_col].notna()]
+    agg = subset.groupby(group_col, sort=False, observed=True)[list(value_cols)].agg(["count", "mean", "var"])
+    counts = agg.xs("count", axis=1, level=1).to_numpy(dtype=float)
+    means = agg.xs("mean", axis=1, level=1).to_numpy(dtype=float)
+    variances = agg.xs("var", axis=1, level=1).to_numpy(dtype=float)
+    sum_sq = np.where(counts > 1, variances * (counts - 1), 0.0)
+    return {
+        "groups": agg.index.tolist(),
+        "count": counts,
+        "mean": means,
+        "ss": sum_sq,
+    }
+
+
+def anova_from_moments(counts, means, sum_sq, min_group_size: int = 2) -> dict:
+    """Classic one-way ANOVA and eta-squared from per-group moments of a single value column.
+
+    Only groups with at least min_group_size observations enter the F test
+    (matching f_oneway on those groups); eta-squared uses every group, which
+    equals SS_between / SS_total over the raw data.
+    """
+    counts = np.asarray(counts, dtype=float)
+    means = np.asarray(means, dtype=float)
+    sum_sq = np.asarray(sum_sq, dtype=float)
+
+    present = counts > 0
+    n_all = counts[present].sum()
+    grand_all = (counts[present] * means[present]).sum() / n_all if n_all else np.nan
+    ss_between_all = (counts[present] * (means[present] - grand_all) ** 2).sum()
+    ss_total = ss_between_all + sum_sq[present].sum()
+    eta_sq = ss_between_all / ss_total if ss_total else np.nan
+
+    used = counts >= min_group_size
+    k_groups = int(used.sum())
+    n_used = counts[used].sum()
+    f_stat, p_val = np.nan, np.nan
+    if k_groups >= 2 and n_used > k_groups:
+        grand = (counts[used] * means[used]).sum() / n_used
+        ss_between = (counts[used] * (means[used] - grand) ** 2).sum()
+        ss_within = sum_sq[used].sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f_stat = (ss_between / (k_groups - 1)) / (ss_within / (n_used - k_groups))
+        p_val = float(stats.f.sf(f_stat, k_groups - 1, n_used - k_groups))
+
+    return {
+        "f": float(f_stat),
+        "p": p_val,
+        "df_between": k_groups - 1,
+        "df_within": int(n_used - k_groups),
+        "eta_sq": float(eta_sq),
+    }
+
+
+def welch_anova_from_moments(counts, means, sum_sq) -> dict:
+    """Welch's heteroscedastic one-way ANOVA from per-group moments (groups need 2+ observations)."""
+    counts = np.asarray(counts, dtype=float)
+    means = np.asarray(means, dtype=float)
+    sum_sq = np.asarray(sum_sq, dtype=float)
+
+    used = counts >= 2
+    n_i, m_i = counts[used], means[used]
+    var_i = sum_sq[used] / (n_i - 1)
+    k_groups = len(n_i)
+    if k_groups < 2 or np.any(var_i <= 0):
+        return {"f": np.nan, "p": np.nan, "df1": np.nan, "df2": np.nan}
+
+    weights = n_i / var_i
+    weight_total = weights.sum()
+    weighted_mean = (weights * m_i).sum() / weight_total
+    between = (weights * (m_i - weighted_mean) ** 2).sum() / (k_groups - 1)
+    lam = ((1 - weights / weight_total) ** 2 / (n_i - 1)).sum()
+    f_stat = between / (1 + 2 * (k_groups - 2) / (k_groups ** 2 - 1) * lam)
+    df2 = (k_groups ** 2 - 1) / (3 * lam)
+    return {
+        "f": float(f_stat),
+        "p": float(stats.f.sf(f_stat, k_groups - 1, df2)),
+        "df1": k_groups - 1,
+        "df2": float(df2),
+    }
+
+
+def posthoc_from_moments(groups, counts, means, sum_sq, alpha: float = 0.05, method: str = "tukey") -> pd.DataFrame:
+    """Pairwise post-hoc comparisons from per-group moments.
+
+    method="tukey" is Tukey-Kramer HSD with the pooled error term;
+    method="games-howell" uses per-pair Welch standard errors and degrees of
+    freedom. Both use the studentized range distribution.
+    """
+    counts = np.asarray(counts, dtype=float)
+    means = np.asarray(means, dtype=float)
+    sum_sq = np.asarray(sum_sq, dtype=float)
+
+    min_size = 2 if method == "games-howell" else 1
+    keep = [idx for idx in np.argsort([str(g) for g in groups]) if counts[idx] >= min_size]
+    k_groups = len(keep)
+    if k_groups < 2:
+        return pd.DataFrame()
+
+    idx_a, idx_b = (np.array(pair) for pair in zip(*combinations(keep, 2)))
+    n_a, n_b = counts[idx_a], counts[idx_b]
+    mean_diff = means[idx_b] - means[idx_a]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "games-howell":
+            var_a = sum_sq[idx_a] / (n_a - 1)
+            var_b = sum_sq[idx_b] / (n_b - 1)
+            se = np.sqrt((var_a / n_a + var_b / n_b) / 2)
+            dof = (var_a / n_a + var_b / n_b) ** 2 / (
+                (var_a / n_a) ** 2 / (n_a - 1) + (var_b / n_b) ** 2 / (n_b - 1)
+            )
+        else:
+            n_total = counts[keep].sum()
+            mse = sum_sq[keep].sum() / (n_total - k_groups)
+            se = np.sqrt(mse / 2 * (1 / n_a + 1 / n_b))
+            dof = np.full_like(se, n_total - k_groups)
+        q_stat = np.abs(mean_diff) / se
+        p_adj = stats.studentized_range.sf(q_stat, k_groups, dof)
+        q_crit = stats.studentized_range.ppf(1 - alpha, k_groups, dof)
+
+    group_labels = np.array([str(g) for g in groups], dtype=object)
+    return pd.DataFrame({
+        "group1": group_labels[idx_a],
+        "group2": group_labels[idx_b],
+        "meandiff": mean_diff,
+        "p-adj": p_adj,
+        "lower": mean_diff - q_crit * se,
+        "upper": mean_diff + q_crit * se,
+        "reject": p_adj < alpha,
+    })
+
+
+def _dagostino_k2(n, skew, kurt):
+    """D'Agostino-Pearson K² from biased sample skewness and (non-excess) kurtosis, vectorized over columns."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = skew * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+        beta2 = 3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2) * (n + 5) * (n + 7) * (n + 9))
+        w2 = -1 + np.sqrt(2 * (beta2 - 1))
+        delta = 1 / np.sqrt(0.5 * np.log(w2))
+        alpha = np.sqrt(2.0 / (w2 - 1))
+        y = np.where(y == 0, 1, y)
+        z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+        expected = 3.0 * (n - 1) / (n + 1)
+        var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) ** 2 * (n + 3) * (n + 5))
+        x = (kurt - expected) / np.sqrt(var_b2)
+        sqrt_beta1 = 6.0 * (n ** 2 - 5 * n + 2) / ((n + 7) * (n + 9)) * np.sqrt(6.0 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3)))
+        a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+        denom = 1 + x * np.sqrt(2 / (a - 4.0))
+        term2 = np.sign(denom) * np.where(denom == 0, np.nan, ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+        z_kurt = (1 - 2.0 / (9.0 * a) - term2) / np.sqrt(2 / (9.0 * a))
+
+    k2 = z_skew ** 2 + z_kurt ** 2
+    return k2, stats.chi2.sf(k2, 2)
+
+
+def _anderson_darling(ordered, n, mean, std):
+    """Anderson-Darling A² against a normal with estimated parameters, for NaN-last sorted columns.
+
+    p-values use the D'Agostino & Stephens (1986) approximation on the
+    small-sample adjusted statistic.
+    """
+    n_rows = ordered.shape[0]
+    rank = np.arange(n_rows)[:, None]
+    valid = rank < n
+    # np.select evaluates every branch, so the unused ones may overflow.
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        z = (ordered - mean) / std
+        # Pair the i-th smallest with the i-th largest valid value of the same column.
+        mirror = np.clip(n.astype(int) - 1 - rank, 0, max(n_rows - 1, 0))
+        log_cdf = stats.norm.logcdf(z)
+        log_sf = np.take_along_axis(stats.norm.logsf(z), mirror, axis=0)
+        terms = np.where(valid, (2 * rank + 1) * (log_cdf + log_sf), 0.0)
+        a2 = -n - terms.sum(axis=0) / n
+        adjusted = a2 * (1 + 0.75 / n + 2.25 / n ** 2)
+        p_val = np.select(
+            [adjusted >= 10, adjusted >= 0.6, adjusted >= 0.34, adjusted >= 0.2],
+            [
+                # The quadratic term turns the approximation back up far in the tail (p < 1e-23 here).
+                0.0,
+                np.exp(1.2937 - 5.709 * adjusted + 0.0186 * adjusted ** 2),
+                np.exp(0.9177 - 4.279 * adjusted - 1.38 * adjusted ** 2),
+                1 - np.exp(-8.318 + 42.796 * adjusted - 59.938 * adjusted ** 2),
+            ],
+            1 - np.exp(-13.436 + 101.14 * adjusted - 223.73 * adjusted ** 2),
+        )
+    return a2, np.clip(p_val, 0.0, 1.0)
+
+
+def _normality_block(values: np.ndarray) -> dict:
+    n = (~np.isnan(values)).sum(axis=0).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(values, axis=0) / n
+        centered = values - mean
+        m2 = np.nansum(centered ** 2, axis=0) / n
+        m3 = np.nansum(centered ** 3, axis=0) / n
+        m4 = np.nansum(centered ** 4, axis=0) / n
+        del centered
+        skew = m3 / m2 ** 1.5
+        kurt = m4 / m2 ** 2
+        jarque_bera = n / 6.0 * (skew ** 2 + (kurt - 3) ** 2 / 4.0)
+    k2, k2_p = _dagostino_k2(n, skew, kurt)
+    a2, a2_p = _anderson_darling(np.sort(values, axis=0), n, mean, np.sqrt(m2 * n / (n - 1)))
+
+    degenerate = (n < 3) | ~(m2 > 0)
+    too_small = degenerate | (n < DAGOSTINO_MIN_ROWS)
+    return {
+        "n": n.astype(int),
+        "skew": np.where(degenerate, np.nan, skew),
+        "excess_kurtosis": np.where(degenerate, np.nan, kurt - 3),
+        "k2": np.where(too_small, np.nan, k2),
+        "k2_p": np.where(too_small, np.nan, k2_p),
+        "ad": np.where(degenerate, np.nan, a2),
+        "ad_p": np.where(degenerate, np.nan, a2_p),
+        "jb": np.where(degenerate, np.nan, jarque_bera),
+        "jb_p": np.where(degenerate, np.nan, stats.chi2.sf(jarque_bera, 2)),
+    }
+
+
+def normality_screen(df: pd.DataFrame, numeric_cols: List) -> pd.DataFrame:
+    """Normality tests for every numeric column without subsampling.
+
+    D'Agostino K², Anderson-Darling and Jarque-Bera come from one moments
+    pass and one sort per block of columns. Shapiro-Wilk is added only for
+    columns with at most SHAPIRO_MAX_ROWS values, and those columns are
+    dispatched to the process pool. "Primary test" is Shapiro-Wilk when it
+    ran, otherwise D'Agostino K².
+    """
+    blocks = []
+    for start in range(0, len(numeric_cols), NORMALITY_COLUMN_BLOCK):
+        block_cols = numeric_cols[start:start + NORMALITY_COLUMN_BLOCK]
+        values = df[block_cols].to_numpy(dtype=float, na_value=np.nan)
+        blocks.append(pd.DataFrame(_normality_block(values), index=block_cols))
+    if not blocks:
+        return pd.DataFrame()
+    result = pd.concat(blocks)
+
+    # Constant columns are left out: Shapiro-Wilk reports W=1 for them, which reads as "normal".
+    small_cols = [
+        col for col in numeric_cols
+        if pd.notna(result.at[col, "ad"]) and result.at[col, "n"] <= SHAPIRO_MAX_ROWS
+    ]
+    shapiro = _run_tasks(_shapiro_task, [df[col].dropna().to_numpy(dtype=float) for col in small_cols])
+    result["shapiro_w"] = np.nan
+    result["shapiro_p"] = np.nan
+    for col, (w_stat, p_val) in zip(small_cols, shapiro):
+        result.at[col, "shapiro_w"] = w_stat
+        result.at[col, "shapiro_p"] = p_val
+
+    use_shapiro = result["shapiro_p"].notna()
+    result["primary_test"] = np.where(use_shapiro, "Shapiro-Wilk", "D'Agostino K²")
+    result["primary_p"] = np.where(use_shapiro, result["shapiro_p"], result["k2_p"])
+    result.index.name = "column"
+    return result.reset_index()
+
+
+def _pearson_rows(df, numeric_cols, correlation_with_counts):
+    if len(numeric_cols) < 2:
+        return []
+    corr_df, count_df = correlation_with_counts(df, numeric_cols)
+    r = corr_df.to_numpy()
+    n = count_df.to_numpy()
+    upper = np.triu_indices(len(numeric_cols), k=1)
+    r_pairs = r[upper]
+    n_pairs = n[upper]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = r_pairs * np.sqrt((n_pairs - 2) / (1 - r_pairs ** 2))
+        p_vals = 2 * stats.t.sf(np.abs(t_stat), n_pairs - 2)
+    p_vals = np.where(n_pairs >= 3, p_vals, np.nan)
+    return [
+        ["Pearson Correlation", numeric_cols[i], numeric_cols[j], int(n_pairs[k]), r_pairs[k], p_vals[k]]
+        for k, (i, j) in enumerate(zip(*upper))
+    ]
+
+
+def _two_group_columns(df, categorical_cols):
+    return [col for col in categorical_cols if df[col].dropna().nunique() == 2]
+
+
+def _welch_rows(df, numeric_cols, categorical_cols):
+    rows = []
+    for group_col in _two_group_columns(df, categorical_cols):
+        value_cols = [col for col in numeric_cols if col != group_col]
+        if not value_cols:
+            continue
+        moments = grouped_moments(df, group_col, value_cols)
+        n_a, n_b = moments["count"]
+        mean_a, mean_b = moments["mean"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var_a = moments["ss"][0] / (n_a - 1)
+            var_b = moments["ss"][1] / (n_b - 1)
+            se_sq = var_a / n_a + var_b / n_b
+            t_stat = (mean_a - mean_b) / np.sqrt(se_sq)
+            dof = se_sq ** 2 / ((var_a / n_a) ** 2 / (n_a - 1) + (var_b / n_b) ** 2 / (n_b - 1))
+            p_vals = 2 * stats.t.sf(np.abs(t_stat), dof)
+        p_vals = np.where((n_a >= 2) & (n_b >= 2), p_vals, np.nan)
+        label = f"{group_col} ({moments['groups'][0]} vs {moments['groups'][1]})"
+        for idx, value_col in enumerate(value_cols):
+            rows.append(["Welch T-Test", value_col, label, int(n_a[idx] + n_b[idx]), t_stat[idx], p_vals[idx]])
+    return rows
+
+
+def _anova_rows(df, numeric_cols, categorical_cols):
+    rows = []
+    for group_col in categorical_cols:
+        if not 2 <= df[group_col].dropna().nunique() <= BATCH_MAX_GROUPS:
+            continue
+        value_cols = [col for col in numeric_cols if col != group_col]
+        if not value_cols:
+            continue
+        moments = grouped_moments(df, group_col, value_cols)
+        # Like the single-test branch, only groups with 2+ observations enter the F test.
+        counts = np.where(moments["count"] >= 2, moments["count"], 0.0)
+        k_groups = (counts > 0).sum(axis=0)
+        n_total = counts.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            grand_mean = np.nansum(counts * moments["mean"], axis=0) / n_total
+            ss_between = np.nansum(counts * (moments["mean"] - grand_mean) ** 2, axis=0)
+            ss_within = np.where(counts > 0, moments["ss"], 0.0).sum(axis=0)
+            f_stat = (ss_between / (k_groups - 1)) / (ss_within / (n_total - k_groups))
+            p_vals = stats.f.sf(f_stat, k_groups - 1, n_total - k_groups)
+        p_vals = np.where(k_groups >= 2, p_vals, np.nan)
+        for idx, value_col in enumerate(value_cols):
+            rows.append(["One-way ANOVA", value_col, group_col, int(n_total[idx]), f_stat[idx], p_vals[idx]])
+    return rows
+
+
+def _mannwhitney_task(args):
+    sample_a, sample_b = args
+    if len(sample_a) < 2 or len(sample_b) < 2:
+        return np.nan, np.nan
+    result = stats.mannwhitneyu(sample_a, sample_b, alternative="two-sided")
+    return float(result[0]), float(result[1])
+
+
+def _chi_square_task(table):
+    if table.shape[0] < 2 or table.shape[1] < 2:
+        return np.nan, np.nan
+    chi2, p_val, _, _ = stats.chi2_contingency(table)
+    return float(chi2), float(p_val)
+
+
+def _shapiro_task(values):
+    if len(values) < 3:
+        return np.nan, np.nan
+    result = stats.shapiro(values)
+    return float(result[0]), float(result[1])
+
+
+def _run_tasks(func: Callable, tasks: list) -> list:
+    """Run scipy calls on a process pool when there are enough of them; fall back to serial."""
+    if len(tasks) >= PROCESS_POOL_MIN_TASKS and PROCESS_POOL_MAX_WORKERS > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=PROCESS_POOL_MAX_WORKERS) as executor:
+                return list(executor.map(func, tasks, chunksize=max(1, len(tasks) // (PROCESS_POOL_MAX_WORKERS * 4))))
+        except Exception:
+            pass
+    return [func(task) for task in tasks]
+
+
+def _mannwhitney_rows(df, numeric_cols, categorical_cols):
+    labels, tasks = [], []
+    for group_col in _two_group_columns(df, categorical_cols):
+        for value_col in numeric_cols:
+            if value_col == group_col:
+                continue
+            subset = df[[value_col, group_col]].dropna()
+            groups = subset[group_col].unique().tolist()
+            if len(groups) != 2:
+                continue
+            sample_a = subset.loc[subset[group_col] == groups[0], value_col].to_numpy(dtype=float)
+            sample_b = subset.loc[subset[group_col] == groups[1], value_col].to_numpy(dtype=float)
+            labels.append((value_col, f"{group_col} ({groups[0]} vs {groups[1]})", len(subset)))
+            tasks.append((sample_a, sample_b))
+    results = _run_tasks(_mannwhitney_task, tasks)
+    return [["Mann-Whitney U", v, g, n, stat, p] for (v, g, n), (stat, p) in zip(labels, results)]
+
+
+def _chi_square_rows(df, categorical_cols):
+    labels, tasks = [], []
+    eligible = [col for col in categorical_cols if df[col].nunique() <= BATCH_MAX_GROUPS]
+    for col_left, col_right in combinations(eligible, 2):
+        subset = df[[col_left, col_right]].dropna()
+        table = pd.crosstab(subset[col_left], subset[col_right]).to_numpy()
+        labels.append((col_left, col_right, len(subset)))
+        tasks.append(table)
+    results = _run_tasks(_chi_square_task, tasks)
+    return [["Chi-Square", a, b, n, stat, p] for (a, b, n), (stat, p) in zip(labels, results)]
+
+
+def _normality_rows(df, numeric_cols):
+    screen = normality_screen(df, numeric_cols)
+    rows = []
+    for row in screen.itertuples(index=False):
+        statistic = row.shapiro_w if row.primary_test == "Shapiro-Wilk" else row.k2
+        rows.append([row.primary_test, row.column, "", int(row.n), statistic, row.primary_p])
+    return rows
+
+
+def run_batch_tests(
+    df: pd.DataFrame,
+    test_name: str,
+    numeric_cols: List,
+    categorical_cols: List,
+    correlation_with_counts: Callable,
+    correction: Optional[str] = "fdr_bh",
+    alpha: float = 0.05,
+) -> pd.DataFrame:
+    """Run one test across every eligible column/group combination and return a single results table.
+
+    Pearson, Welch and ANOVA statistics are derived in bulk from shared
+    correlation statistics and grouped moments; Mann-Whitney, chi-square and
+    small-sample Shapiro-Wilk are dispatched to a process pool.
+    """
+    if test_name == "Pearson Correlation":
+        rows = _pearson_rows(df, numeric_cols, correlation_with_counts)
+    elif test_name == "Welch T-Test":
+        rows = _welch_rows(df, numeric_cols, categorical_cols)
+    elif test_name == "Mann-Whitney U":
+        rows = _mannwhitney_rows(df, numeric_cols, categorical_cols)
+    elif test_name == "One-way ANOVA":
+        rows = _anova_rows(df, numeric_cols, categorical_cols)
+    elif test_name == "Chi-Square":
+        rows = _chi_square_rows(df, categorical_cols)
+    elif test_name == "Normality":
+        rows = _normality_rows(df, numeric_cols)
+    else:
+        raise ValueError(f"Unknown batch test: {test_name}")
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    results["Adjusted P"] = adjust_pvalues(results["P-value"].to_numpy(dtype=float), correction)
+    results["Significant"] = results["Adjusted P"] < alpha
+    return results.sort_values("Adjusted P", na_position="last").reset_index(drop=True)
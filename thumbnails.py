@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from blob_cache import BlobCache
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+THUMBNAIL_CACHE_DIR = os.environ.get(
+    "KSURA_THUMBNAIL_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ksura", "thumbnails"),
+)
+THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get("KSURA_THUMBNAIL_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+THUMBNAIL_MAX_PX = 480
+PREVIEW_MAX_PX = 1024
+THUMBNAIL_QUALITY = 80
+
+
+def make_thumbnail(image_bytes: bytes, max_px: int = THUMBNAIL_MAX_PX) -> Optional[Tuple[bytes, str, int, int]]:
+    """Downscale an image so its longer side is at most max_px.
+
+    Returns (bytes, format, width, height): WebP when Pillow was built with it,
+    PNG otherwise; None if Pillow is missing or the bytes aren't an image.
+    """
+    if Image is None or not image_bytes:
+        return None
+    try:
+        with Image.open(BytesIO(image_bytes)) as source:
+            image = source.convert("RGBA") if source.mode not in ("RGB", "RGBA") else source.copy()
+    except Exception:
+        return None
+    image.thumbnail((max_px, max_px), Image.LANCZOS)
+
+    buf = BytesIO()
+    try:
+        image.save(buf, format="WEBP", quality=THUMBNAIL_QUALITY, method=4)
+        fmt = "webp"
+    except Exception:
+        buf = BytesIO()
+        image.save(buf, format="PNG", optimize=True)
+        fmt = "png"
+    return buf.getvalue(), fmt, image.width, image.height
+
+
+def build_visualization_assets(png_bytes: bytes, image_path: str) -> Tuple[Dict[str, bytes], Dict[str, str]]:
+    """Files to publish for a new visualization and the catalog fields that describe them.
+
+    Alongside the original PNG, a thumbnail (grid/list views) and a preview
+    (gallery view) are written next to it as <stem>.thumbnail.<fmt> and
+    <stem>.preview.<fmt>. Their paths and pixel sizes go into the catalog
+    entry. Without Pillow, only the original is published.
+    """
+    files = {image_path: png_bytes}
+    fields: Dict[str, str] = {}
+    stem = image_path.rsplit(".", 1)[0]
+    for label, max_px in (("Thumbnail", THUMBNAIL_MAX_PX), ("Preview", PREVIEW_MAX_PX)):
+        result = make_thumbnail(png_bytes, max_px)
+        if result is None:
+            continue
+        data, fmt, width, height = result
+        path = f"{stem}.{label.lower()}.{fmt}"
+        files[path] = data
+        fields[label] = path
+        fields[f"{label}Width"] = str(width)
+        fields[f"{label}Height"] = str(height)
+    return files, fields
+
+
+class ThumbnailCache:
+    """Thumbnails keyed by (source blob SHA, size), stored with BlobCache's LRU under their own directory."""
+
+    def __init__(self, store: Optional[BlobCache] = None):
+        self.store = store if store is not None else BlobCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES)
+
+    @staticmethod
+    def _key(blob_sha: str, max_px: int) -> str:
+        return hashlib.sha1(f"{blob_sha}\0{max_px}".encode("utf-8")).hexdigest()
+
+    def get(self, blob_sha: Optional[str], max_px: int = THUMBNAIL_MAX_PX) -> Optional[bytes]:
+        if not blob_sha:
+            return None
+        return self.store.get(self._key(blob_sha, max_px))
+
+    def put(self, blob_sha: Optional[str], data: bytes, max_px: int = THUMBNAIL_MAX_PX) -> bool:
+        if not blob_sha:
+            return False
+        return self.store.put(self._key(blob_sha, max_px), data)
+
+
+_shared_cache: Optional[ThumbnailCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ThumbnailCache()
+        return _shared_cache
@@ -2,16 +2,23 @@ import streamlit as st
 import pandas as pd
 import os
 import requests
-import base64
+import hashlib
+from collections import OrderedDict
 from io import StringIO, BytesIO
 import warnings
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from github_client import get_github_client
+from data_ingest import list_workbook_sheets
+from repo_index import get_repo_tree_index, invalidate_tree_index
 
 warnings.filterwarnings("ignore")
 
 GITHUB_REPO_API_UPLOAD = "https://api.github.com/repos/Chakrapani2122/Regen-Ag-Data"
 _UPLOAD_HERE = "Select Folder"
+UPLOAD_MAX_WORKERS = 4
+UPLOAD_FRAME_CACHE_SIZE = 8
 
 
 @st.cache_data(show_spinner=False, ttl=120)
@@ -28,6 +35,16 @@ def get_upload_folders_cached(token, path=""):
     return folders, None, False
 
 
+def get_upload_folders(token, path=""):
+    index, error, auth_error = get_repo_tree_index(get_github_client(token))
+    if auth_error:
+        return [], error, auth_error
+    listing = index.list_dir(path) if index is not None else None
+    if listing is None:
+        return get_upload_folders_cached(token, path)
+    return listing[0], None, False
+
+
 def nav_option_value(item_type, name):
     return f"{item_type}|{name}"
 
@@ -57,7 +74,7 @@ def render_folder_navigation(token):
     level = 0
 
     while True:
-        folders, error, auth_error = get_upload_folders_cached(token, current_path)
+        folders, error, auth_error = get_upload_folders(token, current_path)
         if auth_error:
             st.session_state['gh_token'] = None
             st.session_state['gh_token_validated'] = False
@@ -109,6 +126,65 @@ def render_folder_navigation(token):
     return dest_path
 
 
+def find_existing_upload_paths(client, file_paths):
+    """Return (existing_paths, error, auth_error) for the given destination paths.
+
+    Uses the shared tree index when it is complete, otherwise checks metadata in parallel.
+    """
+    index, _, auth_error = get_repo_tree_index(client)
+    if auth_error:
+        return set(), None, True
+    if index is not None and not index.truncated:
+        return {path for path in file_paths if index.blob_sha(path)}, None, False
+
+    existing = set()
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+        results = list(executor.map(client.get_file_metadata, file_paths))
+    for path, (metadata, error, auth_error) in zip(file_paths, results):
+        if auth_error:
+            return set(), None, True
+        if metadata:
+            existing.add(path)
+        elif error and "status 404" not in error:
+            return set(), error, False
+    return existing, None, False
+
+
+def upload_file_key(uploaded_file):
+    """Identity of an uploaded file's contents: (name, size, content hash)."""
+    digest = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+    return uploaded_file.name, uploaded_file.size, digest
+
+
+def _get_or_parse(cache_key, parse):
+    # Session-scoped LRU so every preview panel reuses one parse per (file, sheet).
+    cache = st.session_state.setdefault("upload_frame_cache", OrderedDict())
+    if cache_key in cache:
+        cache.move_to_end(cache_key)
+        return cache[cache_key]
+    value = parse()
+    cache[cache_key] = value
+    while len(cache) > UPLOAD_FRAME_CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
+def get_upload_sheet_names(uploaded_file, file_key):
+    return _get_or_parse(file_key + ("__sheets__",), lambda: list_workbook_sheets(uploaded_file.getvalue()))
+
+
+def get_upload_dataframe(uploaded_file, file_key, sheet_name=None):
+    def _parse():
+        if uploaded_file.name.endswith(("xls", "xlsx")):
+            return pd.read_excel(BytesIO(uploaded_file.getvalue()), sheet_name=sheet_name)
+        if uploaded_file.name.endswith("csv"):
+            return pd.read_csv(BytesIO(uploaded_file.getvalue()))
+        content = StringIO(uploaded_file.getvalue().decode("utf-8"))
+        return pd.read_csv(content, delimiter="\t")
+
+    return _get_or_parse(file_key + (sheet_name,), _parse)
+
+
 def get_github_folders(token):
     headers = {"Authorization": f"token {token}"}
     url = "https://api.github.com/repos/Chakrapani2122/Regen-Ag-Data/contents/"
@@ -188,35 +264,24 @@ def main():
         # Step 4: File selection and sheet selection
         selected_file = st.selectbox("Select a file to view:", uploaded_files, format_func=lambda x: x.name, key="file_select")
         sheet_name = None
-        if selected_file and selected_file.name.endswith(("xls", "xlsx")):
-            excel_data = pd.ExcelFile(selected_file)
-            sheet_name = st.selectbox("Select a sheet to view:", excel_data.sheet_names, key="sheet_select")
+        file_key = upload_file_key(selected_file) if selected_file else None
+        is_workbook = bool(selected_file and selected_file.name.endswith(("xls", "xlsx")))
+        if is_workbook:
+            sheet_names = get_upload_sheet_names(selected_file, file_key)
+            sheet_name = st.selectbox("Select a sheet to view:", sheet_names, key="sheet_select")
+
+        df = None
+        if selected_file and (sheet_name or not is_workbook):
+            df = get_upload_dataframe(selected_file, file_key, sheet_name=sheet_name)
 
         # Step 4.1: File navigation and display
         with st.expander("File Display"):
-            if selected_file:
-                if selected_file.name.endswith(("xls", "xlsx")) and sheet_name:
-                    df = excel_data.parse(sheet_name)
-                    st.write(df)
-                elif selected_file.name.endswith("csv"):
-                    df = pd.read_csv(selected_file)
-                    st.write(df)
-                else:
-                    content = StringIO(selected_file.getvalue().decode("utf-8"))
-                    df = pd.read_csv(content, delimiter="\t")
-                    st.write(df)
+            if df is not None:
+                st.write(df)
 
         # Step 4.2: Display column names and data types in a table
         with st.expander("Data Types"):
-            if selected_file:
-                if selected_file.name.endswith(("xls", "xlsx")) and sheet_name:
-                    df = excel_data.parse(sheet_name)
-                elif selected_file.name.endswith("csv"):
-                    df = pd.read_csv(selected_file)
-                else:
-                    content = StringIO(selected_file.getvalue().decode("utf-8"))
-                    df = pd.read_csv(content, delimiter="\t")
-
+            if df is not None:
                 if not df.empty:
                     col_data = []
                     for col in df.columns:
@@ -248,42 +313,59 @@ def main():
                 st.warning("Please select a destination folder before uploading.")
                 return
             try:
-                for file in uploaded_files:
-                    file_path = f"{dest_path}/{file.name}"
-                    metadata, metadata_error, metadata_auth_error = client.get_file_metadata(file_path)
-                    if metadata_auth_error:
-                        st.session_state['gh_token'] = None
-                        st.session_state['gh_token_validated'] = False
-                        st.error("Authentication failed. Please re-enter your security token.")
-                        return
-
-                    if metadata:
-                        st.warning(f"File '{file.name}' already exists at '{dest_path}'.")
-                        continue
-
-                    if metadata_error and "status 404" not in metadata_error:
-                        st.error(f"Error checking file existence: {metadata_error}")
-                        continue
-
-                    content = file.getvalue()
-                    _, upload_error, upload_auth_error = client.put_file(
-                        file_path=file_path,
-                        message=f"Add {file.name}",
-                        content_b64=base64.b64encode(content).decode("utf-8"),
+                files_by_path = {f"{dest_path}/{file.name}": file for file in uploaded_files}
+                existing, check_error, check_auth_error = find_existing_upload_paths(client, list(files_by_path))
+                if check_auth_error:
+                    st.session_state['gh_token'] = None
+                    st.session_state['gh_token_validated'] = False
+                    st.error("Authentication failed. Please re-enter your security token.")
+                    return
+                if check_error:
+                    st.error(f"Error checking file existence: {check_error}")
+                    return
+
+                for file_path in existing:
+                    st.warning(f"File '{files_by_path[file_path].name}' already exists at '{dest_path}'.")
+
+                pending = {path: file.getvalue() for path, file in files_by_path.items() if path not in existing}
+                if not pending:
+                    return
+
+                # All new files go up as one commit: blobs in parallel, then a single tree + commit.
+                progress = st.progress(0.0, text=f"Uploading {len(pending)} file(s)...")
+                finished = []
+
+                def _on_blob_done(file_path, error):
+                    finished.append(file_path)
+                    status = "Failed" if error else "Uploaded"
+                    progress.progress(
+                        len(finished) / len(pending),
+                        text=f"{status} {len(finished)}/{len(pending)}: {files_by_path[file_path].name}",
                     )
-                    if upload_auth_error:
-                        st.session_state['gh_token'] = None
-                        st.session_state['gh_token_validated'] = False
-                        st.error("Authentication failed. Please re-enter your security token.")
-                        return
-                    if upload_error:
-                        st.error(f"Error uploading '{file.name}': {upload_error}")
-                        continue
-
-                    st.success(f"File '{file.name}' uploaded successfully.")
-                    from datetime import datetime
+
+                names = [files_by_path[path].name for path in pending]
+                message = f"Add {names[0]}" if len(names) == 1 else f"Add {len(names)} files to {dest_path}"
+                _, upload_error, upload_auth_error = client.commit_files(
+                    pending,
+                    message=message,
+                    max_workers=UPLOAD_MAX_WORKERS,
+                    on_progress=_on_blob_done,
+                    create_only=True,
+                )
+                if upload_auth_error:
+                    st.session_state['gh_token'] = None
+                    st.session_state['gh_token_validated'] = False
+                    st.error("Authentication failed. Please re-enter your security token.")
+                    return
+                if upload_error:
+                    st.error(f"Error uploading files: {upload_error}")
+                    return
+
+                invalidate_tree_index(client.repo)
+                for name in names:
+                    st.success(f"File '{name}' uploaded successfully.")
                     st.session_state.upload_history.append({
-                        'file': file.name,
+                        'file': name,
                         'folder': dest_path,
                         'time': datetime.now().strftime('%Y-%m-%d %H:%M')
                     })
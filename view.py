@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from io import BytesIO, StringIO
+from io import BytesIO
 import docx
 import seaborn as sns
 import matplotlib.pyplot as plt
@@ -13,12 +13,37 @@ try:
 except Exception:
     stats = None
 
-try:
-    from statsmodels.stats.multicomp import pairwise_tukeyhsd
-except Exception:
-    pairwise_tukeyhsd = None
-
 from github_client import get_github_client
+from frame_cache import get_frame_cache
+from analytics import (
+    frame_key,
+    get_correlation,
+    get_correlation_with_counts,
+    get_describe,
+    get_duplicate_count,
+    get_missing_counts,
+    get_normality_screen,
+    get_profile,
+)
+from stats_engine import (
+    BATCH_TESTS,
+    CORRECTIONS,
+    POSTHOC_MAX_GROUPS,
+    SHAPIRO_MAX_ROWS,
+    anova_from_moments,
+    grouped_moments,
+    posthoc_from_moments,
+    run_batch_tests,
+    welch_anova_from_moments,
+)
+from resampling import RESAMPLE_DEFAULT_COUNT, run_resampling
+from data_ingest import (
+    STREAM_INGEST_MIN_BYTES,
+    list_workbook_sheets,
+    read_delimited,
+    read_delimited_chunked,
+)
+from repo_index import get_repo_tree_index
 
 warnings.filterwarnings("ignore")
 
@@ -55,10 +80,31 @@ def get_repo_contents_cached(token, path=""):
     return sorted(folders), sorted(files), None, False
 
 
+def get_repo_contents(token, path=""):
+    """List folders/files at path from the shared tree index, falling back to the contents API."""
+    index, _, auth_error = get_repo_tree_index(get_github_client(token))
+    if auth_error:
+        return [], [], "Authentication failed or token expired.", True
+    listing = index.list_dir(path) if index is not None else None
+    if listing is None:
+        return get_repo_contents_cached(token, path)
+
+    folders, files = listing
+    if not path:
+        folders = [f for f in folders if f not in ROOT_EXCLUDED_FOLDERS]
+        files = [f for f in files if f not in ROOT_EXCLUDED_FILES]
+    return folders, files, None, False
+
+
+def get_indexed_blob_sha(token, file_path):
+    index, _, _ = get_repo_tree_index(get_github_client(token))
+    return index.blob_sha(file_path) if index is not None else None
+
+
 @st.cache_data(show_spinner=False, ttl=180)
-def get_github_file_content_cached(token, file_path):
+def get_github_file_content_cached(token, file_path, sha=None):
     client = get_github_client(token)
-    content, error, auth_error, metadata = client.get_file_content(file_path)
+    content, error, auth_error, metadata = client.get_file_content(file_path, sha=sha)
     sha = metadata.get("sha") if metadata else None
     return content, error, auth_error, sha
 
@@ -67,6 +113,11 @@ def prefetch_next_level_contents(token, current_path, selected_folder):
     if not selected_folder:
         return
 
+    # Nothing to warm when the tree index already answers every level.
+    index, _, _ = get_repo_tree_index(get_github_client(token))
+    if index is not None and not index.truncated:
+        return
+
     next_path = f"{current_path}/{selected_folder}" if current_path else selected_folder
 
     # Warm cache for immediate next path and first-level subfolders.
@@ -80,34 +131,10 @@ def prefetch_next_level_contents(token, current_path, selected_folder):
             executor.submit(get_repo_contents_cached, token, child_path)
 
 def parse_csv_file(file_content):
-    encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-    parse_attempts = [
-        {"sep": ",", "engine": "python"},
-        {"sep": None, "engine": "python"},
-    ]
-
-    last_error = None
-    for encoding in encodings:
-        for parse_kwargs in parse_attempts:
-            try:
-                text = file_content.decode(encoding)
-                return pd.read_csv(StringIO(text), **parse_kwargs), None
-            except Exception as exc:
-                last_error = exc
-
-    return None, str(last_error) if last_error else "Unknown CSV parsing error."
+    return read_delimited(file_content, default_sep=",")
 
 def parse_tsv_file(file_content):
-    encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-    last_error = None
-    for encoding in encodings:
-        try:
-            text = file_content.decode(encoding)
-            return pd.read_csv(StringIO(text), sep="\t", engine="python"), None
-        except Exception as exc:
-            last_error = exc
-
-    return None, str(last_error) if last_error else "Unknown TSV parsing error."
+    return read_delimited(file_content, default_sep="\t")
 
 def decode_text_file(file_content):
     encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
@@ -120,24 +147,83 @@ def decode_text_file(file_content):
     return None, str(last_error) if last_error else "Unknown text decoding error."
 
 
+@st.cache_data(show_spinner=False)
+def get_sheet_names_cached(file_sha, _file_content):
+    # Keyed by blob SHA only; the leading underscore keeps Streamlit from hashing the bytes.
+    return list_workbook_sheets(_file_content)
+
+
+def get_sheet_names(file_content, file_sha=None):
+    if file_sha:
+        return get_sheet_names_cached(file_sha, file_content)
+    return list_workbook_sheets(file_content)
+
+
 @st.cache_data(show_spinner=False, ttl=300)
 def parse_dataframe_cached(file_name, file_content, sheet_name=None, file_sha=None):
-    del file_sha
+    """(df, error, dialect); dialect is what the delimited parser actually used (None for Excel)."""
+    frame_cache = get_frame_cache()
+    cached_df = frame_cache.get(file_sha, sheet_name)
+    if cached_df is not None:
+        return cached_df, None, cached_df.attrs.get("dialect")
+
+    df, error, dialect = parse_dataframe(file_name, file_content, sheet_name=sheet_name)
+    if df is not None:
+        if dialect:
+            # Kept in attrs so the Arrow sidecar round-trips it with the frame.
+            df.attrs["dialect"] = dialect
+        frame_cache.put(file_sha, sheet_name, df)
+    return df, error, dialect
+
+
+def parse_dataframe(file_name, file_content, sheet_name=None):
     file_name_lower = file_name.lower()
 
     if file_name_lower.endswith((".xls", ".xlsx")):
-        excel_data = pd.ExcelFile(BytesIO(file_content))
         if not sheet_name:
-            return None, "Please select a sheet."
-        return excel_data.parse(sheet_name), None
+            return None, "Please select a sheet.", None
+        return pd.read_excel(BytesIO(file_content), sheet_name=sheet_name), None, None
 
-    if file_name_lower.endswith(".csv"):
+    if file_name_lower.endswith((".csv", ".dat")):
         return parse_csv_file(file_content)
 
     if file_name_lower.endswith(".tsv"):
         return parse_tsv_file(file_content)
 
-    return None, "Unsupported dataframe format for parsing."
+    return None, "Unsupported dataframe format for parsing.", None
+
+def load_delimited_streaming(file_content, default_sep, file_sha=None):
+    """Chunked load for very large delimited files, previewing the first rows while the rest streams in.
+
+    Returns (df, error, dialect).
+    """
+    memo = st.session_state.get("view_streamed_frame")
+    if memo and file_sha and memo[0] == file_sha:
+        return memo[1], None, memo[1].attrs.get("dialect")
+
+    frame_cache = get_frame_cache()
+    df = frame_cache.get(file_sha)
+    if df is None:
+        preview = st.empty()
+        progress = st.progress(0.0, text="Loading rows...")
+
+        def _on_chunk(chunk, rows_loaded, fraction):
+            if rows_loaded == len(chunk):
+                preview.dataframe(chunk.head(100), use_container_width=True)
+            progress.progress(fraction, text=f"Loaded {rows_loaded:,} rows...")
+
+        df, error, dialect = read_delimited_chunked(file_content, default_sep, on_chunk=_on_chunk)
+        progress.empty()
+        preview.empty()
+        if df is None:
+            return None, error, dialect
+        df.attrs["dialect"] = dialect
+        frame_cache.put(file_sha, None, df)
+
+    if file_sha:
+        st.session_state["view_streamed_frame"] = (file_sha, df)
+    return df, None, df.attrs.get("dialect")
+
 
 def read_docx(content):
     """Reads content from a .docx file."""
@@ -167,6 +253,7 @@ def get_file_icon(file_name):
         "csv": "📈",
         "tsv": "📈",
         "txt": "📄",
+        "dat": "📄",
         "docx": "📝",
         "pdf": "📕",
         "png": "🖼️",
@@ -190,13 +277,14 @@ def format_nav_option(option):
         return f"{get_file_icon(item_name)} {item_name}"
     return option
 
-def get_numeric_and_categorical_columns(df):
+def get_numeric_and_categorical_columns(df, memo_key=None):
     numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
     categorical_cols = df.select_dtypes(exclude=["number"]).columns.tolist()
+    distinct = get_profile(df, memo_key)["distinct"]
 
     # Treat low-cardinality numeric columns as categorical candidates for grouping tests.
     for col in numeric_cols:
-        if df[col].nunique(dropna=True) <= 10 and col not in categorical_cols:
+        if distinct.get(col, 0) <= 10 and col not in categorical_cols:
             categorical_cols.append(col)
 
     return numeric_cols, categorical_cols
@@ -275,6 +363,74 @@ def pearson_ci(r_value, n, alpha=0.05):
     return lo, hi
 
 
+RESAMPLING_LABELS = {
+    "mean_diff": "Mean difference",
+    "cohen_d": "Cohen's d",
+    "pearson": "Correlation (r)",
+}
+
+
+def render_resampling_controls(test_key):
+    """Checkbox plus resample count/seed inputs; returns (n_resamples, seed) or None when disabled."""
+    if not st.checkbox("Add bootstrap CIs and permutation p-values", key=f"{test_key}_resampling"):
+        return None
+    controls = render_selector_grid([
+        {
+            "kind": "number",
+            "label": "Resamples",
+            "key": f"{test_key}_resample_count",
+            "min_value": 1000,
+            "max_value": 100000,
+            "value": RESAMPLE_DEFAULT_COUNT,
+            "step": 1000,
+        },
+        {
+            "kind": "number",
+            "label": "Random seed",
+            "key": f"{test_key}_resample_seed",
+            "min_value": 0,
+            "max_value": 2 ** 31 - 1,
+            "value": 42,
+            "step": 1,
+        },
+    ])
+    return int(controls[f"{test_key}_resample_count"]), int(controls[f"{test_key}_resample_seed"])
+
+
+def render_resampling_results(sample_a, sample_b, statistics, settings, alpha, test_key, paired=False):
+    n_resamples, seed = settings
+    progress = st.progress(0.0, text="Resampling...")
+    cancel_slot = st.empty()
+    # Clicking any widget reruns the script, which interrupts the run; the worker pool is shut down on the way out.
+    cancel_slot.button("Cancel resampling", key=f"{test_key}_resample_cancel")
+
+    summary = run_resampling(
+        sample_a,
+        sample_b,
+        statistics,
+        n_resamples=n_resamples,
+        paired=paired,
+        seed=seed,
+        alpha=alpha,
+        on_progress=lambda done, total: progress.progress(done / total, text=f"Resampling: {done}/{total} blocks"),
+    )
+    progress.empty()
+    cancel_slot.empty()
+
+    table = pd.DataFrame([
+        {
+            "Statistic": RESAMPLING_LABELS[name],
+            "Observed": entry["observed"],
+            f"Bootstrap {int((1 - alpha) * 100)}% CI low": entry["ci_low"],
+            f"Bootstrap {int((1 - alpha) * 100)}% CI high": entry["ci_high"],
+            "Permutation p-value": entry["p_value"],
+        }
+        for name, entry in summary.items()
+    ])
+    st.write(f"Resampling ({n_resamples:,} bootstrap and {n_resamples:,} permutation resamples, seed {seed})")
+    st.dataframe(table, use_container_width=True)
+
+
 def cramers_v(chi2, n, rows, cols):
     denom = n * min(rows - 1, cols - 1)
     if denom <= 0:
@@ -282,48 +438,17 @@ def cramers_v(chi2, n, rows, cols):
     return np.sqrt(chi2 / denom)
 
 
-def render_data_quality_profiler(df):
+def render_data_quality_profiler(df, memo_key=None):
     with st.expander("Data Quality Profiler", expanded=False):
-        row_count, col_count = df.shape
-        numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-        object_cols = df.select_dtypes(exclude=["number"]).columns.tolist()
-
-        missing_count = int(df.isna().sum().sum())
-        duplicate_count = int(df.duplicated().sum())
-
-        constant_cols = [c for c in df.columns if df[c].nunique(dropna=True) <= 1]
-        near_constant_cols = []
-        for col in df.columns:
-            vc = df[col].value_counts(dropna=False)
-            if vc.empty:
-                continue
-            top_ratio = float(vc.iloc[0] / len(df)) if len(df) else 0
-            if top_ratio >= 0.95 and col not in constant_cols:
-                near_constant_cols.append(col)
-
-        inconsistent_type_cols = []
-        for col in object_cols:
-            sample = df[col].dropna().head(500)
-            if sample.empty:
-                continue
-            if sample.map(type).nunique() > 1:
-                inconsistent_type_cols.append(col)
-
-        outlier_summary = {}
-        for col in numeric_cols:
-            series = df[col].dropna()
-            if len(series) < 5:
-                continue
-            q1 = series.quantile(0.25)
-            q3 = series.quantile(0.75)
-            iqr = q3 - q1
-            if iqr == 0:
-                continue
-            lower = q1 - 1.5 * iqr
-            upper = q3 + 1.5 * iqr
-            outliers = int(((series < lower) | (series > upper)).sum())
-            if outliers > 0:
-                outlier_summary[col] = outliers
+        profile = get_profile(df, memo_key)
+        row_count = profile["rows"]
+        col_count = profile["columns"]
+        missing_count = profile["missing_total"]
+        duplicate_count = profile["duplicate_count"]
+        constant_cols = profile["constant_cols"]
+        near_constant_cols = profile["near_constant_cols"]
+        inconsistent_type_cols = profile["inconsistent_type_cols"]
+        outlier_summary = profile["outlier_summary"]
 
         stats_cols = st.columns(3)
         stats_cols[0].metric("Rows", row_count)
@@ -331,8 +456,7 @@ def render_data_quality_profiler(df):
         stats_cols[2].metric("Missing Cells", missing_count)
 
         missing_by_column = (
-            df.isna()
-            .sum()
+            profile["missing_by_column"]
             .rename("Missing Values")
             .reset_index()
             .rename(columns={"index": "Column"})
@@ -368,11 +492,11 @@ def render_data_quality_profiler(df):
             st.dataframe(outlier_df, use_container_width=True)
 
 
-def render_smart_recommendations(df):
+def render_smart_recommendations(df, memo_key=None):
     with st.expander("Smart Recommendations", expanded=False):
-        numeric_cols, categorical_cols = get_numeric_and_categorical_columns(df)
-        missing_ratio = float(df.isna().sum().sum() / (df.shape[0] * max(df.shape[1], 1))) if len(df) else 0.0
-        duplicate_count = int(df.duplicated().sum())
+        numeric_cols, categorical_cols = get_numeric_and_categorical_columns(df, memo_key)
+        missing_ratio = float(get_missing_counts(df, memo_key).sum() / (df.shape[0] * max(df.shape[1], 1))) if len(df) else 0.0
+        duplicate_count = get_duplicate_count(df, memo_key)
 
         test_recommendations = []
         chart_recommendations = []
@@ -392,7 +516,7 @@ def render_smart_recommendations(df):
             cleaning_recommendations.append("Address missing values (imputation or filtered analysis)")
         if duplicate_count > 0:
             cleaning_recommendations.append("Review and remove duplicate rows")
-        constant_cols = [c for c in df.columns if df[c].nunique(dropna=True) <= 1]
+        constant_cols = get_profile(df, memo_key)["constant_cols"]
         if constant_cols:
             cleaning_recommendations.append("Drop constant columns with no analytical variance")
 
@@ -412,9 +536,70 @@ def render_smart_recommendations(df):
             st.write(f"- {item}")
 
 
-def render_statistical_tests(df):
+def render_batch_tests(df, numeric_cols, categorical_cols, memo_key=None):
+    controls = render_selector_grid([
+        {
+            "kind": "single",
+            "label": "Test to run on all combinations:",
+            "options": BATCH_TESTS,
+            "key": "batch_test_name",
+        },
+        {
+            "kind": "single",
+            "label": "Multiple-comparison correction",
+            "options": list(CORRECTIONS),
+            "key": "batch_correction",
+        },
+        {
+            "kind": "number",
+            "label": "Significance level (alpha)",
+            "key": "batch_alpha",
+            "min_value": 0.001,
+            "max_value": 0.200,
+            "value": 0.050,
+            "step": 0.001,
+        },
+    ])
+    test_name = controls["batch_test_name"]
+    correction = controls["batch_correction"]
+    alpha = controls["batch_alpha"]
+
+    if st.button("Run Batch", key="run_batch_tests"):
+        with st.spinner(f"Running {test_name} across all eligible combinations..."):
+            results = run_batch_tests(
+                df,
+                test_name,
+                numeric_cols,
+                categorical_cols,
+                correlation_with_counts=lambda frame, cols: get_correlation_with_counts(frame, cols, memo_key),
+                correction=CORRECTIONS[correction],
+                alpha=alpha,
+            )
+        st.session_state["batch_test_results"] = (memo_key, test_name, correction, alpha, results)
+
+    stored = st.session_state.get("batch_test_results")
+    if not stored or stored[:4] != (memo_key, test_name, correction, alpha):
+        return
+
+    results = stored[4]
+    if results.empty:
+        st.info("No eligible column combinations for this test.")
+        return
+
+    st.write(f"**{int(results['Significant'].sum())}** of {len(results)} results significant after correction.")
+    st.dataframe(results, use_container_width=True)
+    st.download_button(
+        "Download results (CSV)",
+        data=results.to_csv(index=False),
+        file_name=f"batch_{test_name.lower().replace(' ', '_').replace('-', '_')}.csv",
+        mime="text/csv",
+        key="download_batch_results",
+    )
+
+
+def render_statistical_tests(df, memo_key=None):
     with st.expander("Statistical Tests", expanded=False):
-        numeric_cols, categorical_cols = get_numeric_and_categorical_columns(df)
+        numeric_cols, categorical_cols = get_numeric_and_categorical_columns(df, memo_key)
 
         st.caption(
             f"Detected {len(numeric_cols)} numeric and {len(categorical_cols)} categorical/grouping columns."
@@ -424,6 +609,10 @@ def render_statistical_tests(df):
             st.warning("SciPy is not available. Install 'scipy' to run statistical tests.")
             return
 
+        if st.checkbox("Batch mode: run one test across all eligible columns", key="view_batch_mode"):
+            render_batch_tests(df, numeric_cols, categorical_cols, memo_key)
+            return
+
         top_controls = render_selector_grid([
             {
                 "kind": "single",
@@ -435,7 +624,7 @@ def render_statistical_tests(df):
                     "Mann-Whitney U (numeric by 2 groups)",
                     "One-way ANOVA (numeric by multi-group category)",
                     "Chi-Square Test (2 categorical columns)",
-                    "Shapiro-Wilk Normality Test (single numeric column)",
+                    "Normality Screening (all numeric columns)",
                 ],
                 "key": "view_test_name",
             },
@@ -483,6 +672,8 @@ def render_statistical_tests(df):
                 st.warning("Need at least 3 non-null paired rows for Pearson correlation.")
                 return
 
+            resampling = render_resampling_controls(test_key)
+
             if not st.button("Run Selected Test", key=f"run_{test_key}"):
                 return
 
@@ -492,6 +683,10 @@ def render_statistical_tests(df):
             st.write(f"{int((1 - alpha) * 100)}% CI for r: **[{ci_low:.4f}, {ci_high:.4f}]**")
             st.write(f"P-value: **{p_val:.6f}**")
             st.write("Result: **Statistically significant**" if p_val < alpha else "Result: **Not statistically significant**")
+            if resampling is not None:
+                render_resampling_results(
+                    pair_df[col1], pair_df[col2], ["pearson"], resampling, alpha, test_key, paired=True
+                )
 
         elif test_name == "Correlation Matrix (multiple numeric columns)":
             if len(numeric_cols) < 2:
@@ -515,7 +710,7 @@ def render_statistical_tests(df):
             if not st.button("Run Selected Test", key=f"run_{test_key}"):
                 return
 
-            corr_df = df[selected].corr(method="pearson")
+            corr_df = get_correlation(df, selected, memo_key)
             st.dataframe(corr_df, use_container_width=True)
 
         elif test_name == "Independent T-Test (numeric by 2 groups)":
@@ -555,6 +750,8 @@ def render_statistical_tests(df):
                 st.warning("Each group needs at least 2 observations.")
                 return
 
+            resampling = render_resampling_controls(test_key)
+
             if not st.button("Run Selected Test", key=f"run_{test_key}"):
                 return
 
@@ -567,6 +764,8 @@ def render_statistical_tests(df):
             st.write(f"Cohen's d: **{d_value:.4f}**")
             st.write(f"{int((1 - alpha) * 100)}% CI for mean difference: **[{ci_low:.4f}, {ci_high:.4f}]**")
             st.write("Result: **Statistically significant**" if p_val < alpha else "Result: **Not statistically significant**")
+            if resampling is not None:
+                render_resampling_results(group_a, group_b, ["mean_diff", "cohen_d"], resampling, alpha, test_key)
 
         elif test_name == "Mann-Whitney U (numeric by 2 groups)":
             if not numeric_cols:
@@ -640,45 +839,53 @@ def render_statistical_tests(df):
             group_col = controls["anova_group_col"]
 
             subset = df[[value_col, group_col]].dropna()
-            grouped_values = [
-                grp[value_col].values
-                for _, grp in subset.groupby(group_col)
-                if len(grp[value_col]) >= 2
-            ]
-            if len(grouped_values) < 2:
+            moments = grouped_moments(subset, group_col, [value_col])
+            counts = moments["count"][:, 0]
+            means = moments["mean"][:, 0]
+            sum_sq = moments["ss"][:, 0]
+            if (counts >= 2).sum() < 2:
                 st.warning("Need at least 2 groups with 2+ observations each.")
                 return
 
+            posthoc_method = st.radio(
+                "Post-hoc test",
+                ["Tukey HSD", "Games-Howell"],
+                horizontal=True,
+                key="anova_posthoc_method",
+                help="Games-Howell does not assume equal group variances.",
+            )
+
             if not st.button("Run Selected Test", key=f"run_{test_key}"):
                 return
 
-            stat, p_val = stats.f_oneway(*grouped_values)
-            overall_mean = subset[value_col].mean()
-            ss_total = ((subset[value_col] - overall_mean) ** 2).sum()
-            ss_between = 0.0
-            for _, grp in subset.groupby(group_col):
-                ss_between += len(grp) * ((grp[value_col].mean() - overall_mean) ** 2)
-            eta_sq = (ss_between / ss_total) if ss_total else np.nan
+            anova = anova_from_moments(counts, means, sum_sq)
+            welch = welch_anova_from_moments(counts, means, sum_sq)
+            p_val = anova["p"]
 
-            st.write(f"F statistic: **{stat:.4f}**")
+            st.write(f"F statistic: **{anova['f']:.4f}**")
             st.write(f"P-value: **{p_val:.6f}**")
-            st.write(f"Eta-squared: **{eta_sq:.4f}**")
+            st.write(f"Eta-squared: **{anova['eta_sq']:.4f}**")
             st.write("Result: **Statistically significant**" if p_val < alpha else "Result: **Not statistically significant**")
-
-            if pairwise_tukeyhsd is not None:
-                tukey_result = pairwise_tukeyhsd(
-                    endog=subset[value_col].astype(float),
-                    groups=subset[group_col].astype(str),
-                    alpha=alpha,
-                )
-                tukey_table = pd.DataFrame(
-                    tukey_result.summary().data[1:],
-                    columns=tukey_result.summary().data[0],
+            if not np.isnan(welch["f"]):
+                st.write(
+                    f"Welch ANOVA (unequal variances): F = **{welch['f']:.4f}**, "
+                    f"p = **{welch['p']:.6f}** (df = {welch['df1']}, {welch['df2']:.1f})"
                 )
-                st.write("Tukey HSD post-hoc")
-                st.dataframe(tukey_table, use_container_width=True)
-            else:
-                st.info("Install statsmodels to enable Tukey HSD post-hoc analysis.")
+
+            if (counts > 0).sum() > POSTHOC_MAX_GROUPS:
+                st.info(f"Post-hoc comparisons are skipped for more than {POSTHOC_MAX_GROUPS} groups.")
+                return
+
+            posthoc_table = posthoc_from_moments(
+                moments["groups"],
+                counts,
+                means,
+                sum_sq,
+                alpha=alpha,
+                method="games-howell" if posthoc_method == "Games-Howell" else "tukey",
+            )
+            st.write(f"{posthoc_method} post-hoc")
+            st.dataframe(posthoc_table, use_container_width=True)
 
         elif test_name == "Chi-Square Test (2 categorical columns)":
             if len(categorical_cols) < 2:
@@ -724,36 +931,48 @@ def render_statistical_tests(df):
             st.write(f"P-value: **{p_val:.6f}**")
             st.write("Result: **Statistically significant**" if p_val < alpha else "Result: **Not statistically significant**")
 
-        elif test_name == "Shapiro-Wilk Normality Test (single numeric column)":
+        elif test_name == "Normality Screening (all numeric columns)":
             if not numeric_cols:
                 st.info("A numeric column is required.")
                 return
 
-            controls = render_selector_grid([
-                {
-                    "kind": "single",
-                    "label": "Numeric column",
-                    "options": numeric_cols,
-                    "key": "shapiro_value_col",
-                },
-            ])
-            value_col = controls["shapiro_value_col"]
-            values = df[value_col].dropna()
-            if len(values) < 3:
-                st.warning("Need at least 3 observations for Shapiro-Wilk.")
-                return
-
-            if len(values) > 5000:
-                values = values.sample(5000, random_state=42)
-                st.caption("Shapiro-Wilk is limited to 5000 rows, so a random sample was used.")
-
+            st.caption(
+                f"D'Agostino K², Anderson-Darling and Jarque-Bera run on every row of each column; "
+                f"Shapiro-Wilk is added for columns with at most {SHAPIRO_MAX_ROWS:,} values."
+            )
             if not st.button("Run Selected Test", key=f"run_{test_key}"):
                 return
 
-            stat, p_val = stats.shapiro(values)
-            st.write(f"W statistic: **{stat:.4f}**")
-            st.write(f"P-value: **{p_val:.6f}**")
-            st.write("Result: **Looks non-normal**" if p_val < alpha else "Result: **No evidence against normality**")
+            with st.spinner("Screening numeric columns..."):
+                screen = get_normality_screen(df, numeric_cols, memo_key)
+
+            table = pd.DataFrame({
+                "Column": screen["column"],
+                "n": screen["n"],
+                "Skewness": screen["skew"],
+                "Excess kurtosis": screen["excess_kurtosis"],
+                "D'Agostino K²": screen["k2"],
+                "K² p-value": screen["k2_p"],
+                "Anderson-Darling A²": screen["ad"],
+                "A² p-value": screen["ad_p"],
+                "Jarque-Bera": screen["jb"],
+                "JB p-value": screen["jb_p"],
+                "Shapiro-Wilk W": screen["shapiro_w"],
+                "W p-value": screen["shapiro_p"],
+                "Primary test": screen["primary_test"],
+                "Result": np.where(
+                    screen["primary_p"].isna(),
+                    "Not enough data",
+                    np.where(screen["primary_p"] < alpha, "Looks non-normal", "No evidence against normality"),
+                ),
+            })
+            st.write(f"**{int((screen['primary_p'] < alpha).sum())}** of {len(screen)} columns look non-normal at alpha = {alpha}.")
+            st.dataframe(table, use_container_width=True)
+            if (screen["n"] > SHAPIRO_MAX_ROWS).any():
+                st.caption(
+                    "With very large samples even negligible departures are significant; "
+                    "judge those columns by skewness and excess kurtosis as well."
+                )
 
 def render_repository_navigation(token):
     # --- Pass 1: walk via session_state to collect every level's (label, options, key) ---
@@ -763,7 +982,7 @@ def render_repository_navigation(token):
     level = 0
 
     while True:
-        folders, files, error, auth_error = get_repo_contents_cached(token, current_path)
+        folders, files, error, auth_error = get_repo_contents(token, current_path)
         if auth_error:
             st.session_state['gh_token'] = None
             st.session_state['gh_token_validated'] = False
@@ -870,7 +1089,9 @@ def main():
     if file_name:
         path = selected_path
         file_path = f"{path}/{file_name}" if path else file_name
-        file_content, file_error, auth_error, file_sha = get_github_file_content_cached(token, file_path)
+        file_content, file_error, auth_error, file_sha = get_github_file_content_cached(
+            token, file_path, sha=get_indexed_blob_sha(token, file_path)
+        )
         if auth_error:
             st.session_state['gh_token'] = None
             st.session_state['gh_token_validated'] = False
@@ -886,21 +1107,27 @@ def main():
 
         if file_name_lower.endswith((".xls", ".xlsx")):
             try:
-                excel_data = pd.ExcelFile(BytesIO(file_content))
-                sheet_name = st.selectbox("Select a sheet:", excel_data.sheet_names, key="view_sheet_select")
+                sheet_names = get_sheet_names(file_content, file_sha=file_sha)
+                sheet_name = st.selectbox("Select a sheet:", sheet_names, key="view_sheet_select")
                 if sheet_name:
-                    df, parse_error = parse_dataframe_cached(file_name, file_content, sheet_name=sheet_name, file_sha=file_sha)
+                    df, parse_error, _ = parse_dataframe_cached(file_name, file_content, sheet_name=sheet_name, file_sha=file_sha)
                     if parse_error:
                         st.error(f"Unable to parse the selected sheet: {parse_error}")
                         return
             except Exception as exc:
                 st.error(f"Unable to read the Excel file: {exc}")
                 return
-        elif file_name_lower.endswith((".csv", ".tsv")):
-            df, parse_error = parse_dataframe_cached(file_name, file_content, file_sha=file_sha)
+        elif file_name_lower.endswith((".csv", ".tsv", ".dat")):
+            default_sep = "\t" if file_name_lower.endswith(".tsv") else ","
+            if len(file_content) >= STREAM_INGEST_MIN_BYTES:
+                df, parse_error, dialect = load_delimited_streaming(file_content, default_sep, file_sha=file_sha)
+            else:
+                df, parse_error, dialect = parse_dataframe_cached(file_name, file_content, file_sha=file_sha)
             if df is None:
                 st.error(f"Unable to parse the file: {parse_error}")
                 return
+            if dialect:
+                st.caption(f"Detected encoding: {dialect['encoding']}, delimiter: {dialect['delimiter']!r}")
         elif file_name_lower.endswith(".txt"):
             text_content, text_error = decode_text_file(file_content)
             if text_content is None:
@@ -931,9 +1158,12 @@ def main():
                 with st.expander("DOCX Content", expanded=True):
                     st.text_area("Content", docx_text, height=700, disabled=True, label_visibility="hidden")
         else:
-            st.warning("Only Excel, CSV, TSV, TXT, Markdown, and DOCX files are supported for preview.")
+            st.warning("Only Excel, CSV, TSV, DAT, TXT, Markdown, and DOCX files are supported for preview.")
 
     if df is not None:
+        memo_key = frame_key(df, source_sha=file_sha, sheet_name=sheet_name)
+        cache_hits, cache_misses = get_frame_cache().stats()
+        st.caption(f"Columnar cache: {cache_hits} hits, {cache_misses} misses")
         with st.expander("File Display", expanded=True):
             selected_cols = st.multiselect(
                 "Select columns to display:",
@@ -965,7 +1195,7 @@ def main():
             with st.expander("Summary", expanded=False):
                 st.write(f"**Shape:** Rows: {df.shape[0]}, Columns: {df.shape[1]}")
                 st.write("**Missing values per column:**")
-                missing_data = df.isnull().sum()
+                missing_data = get_missing_counts(df, memo_key)
                 col1, col2, col3, col4 = st.columns(4)
                 for i, (col_name, missing) in enumerate(missing_data.items()):
                     if i % 4 == 0:
@@ -978,7 +1208,7 @@ def main():
                         col4.write(f"**{col_name}**: {missing}")
 
             with st.expander("Descriptive Statistics", expanded=False):
-                st.write(df.describe(include='all'))
+                st.write(get_describe(df, memo_key))
 
             with st.expander("Correlation Matrix", expanded=False):
                 numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
@@ -992,14 +1222,14 @@ def main():
                         key="corr_matrix_main_cols",
                     )
                     if len(corr_cols) >= 2:
-                        st.dataframe(df[corr_cols].corr(), use_container_width=True)
+                        st.dataframe(get_correlation(df, corr_cols, memo_key), use_container_width=True)
                     else:
                         st.info("Select at least 2 numeric columns.")
 
-            render_data_quality_profiler(df)
-            render_smart_recommendations(df)
+            render_data_quality_profiler(df, memo_key)
+            render_smart_recommendations(df, memo_key)
 
-            render_statistical_tests(df)
+            render_statistical_tests(df, memo_key)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
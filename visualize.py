@@ -1,16 +1,20 @@
 import streamlit as st
 import pandas as pd
 import requests
-from io import BytesIO, StringIO
-import matplotlib.pyplot as plt
-import seaborn as sns
-from xml.etree import ElementTree as ET
+from io import BytesIO
 import io
 from datetime import datetime
-import base64
 import warnings
 import numpy as np
-from github_client import get_github_client
+from github_client import GitHubClient, get_github_client
+from analytics import frame_key, get_correlation, get_missing_counts
+from figure_cache import chart_cache_key, get_figure_cache
+from chart_render import CHART_STYLES, CHART_TYPES, get_render_service
+from data_ingest import STREAM_INGEST_MIN_BYTES, list_workbook_sheets, read_delimited, read_delimited_chunked
+from repo_index import get_repo_tree_index, invalidate_tree_index
+from thumbnails import build_visualization_assets
+from viz_catalog import append_shard_entry, shard_path
+from frame_cache import get_frame_cache
 
 warnings.filterwarnings("ignore")
 
@@ -108,15 +112,32 @@ def get_repo_contents_viz_cached(token, path=""):
     return sorted(folders), sorted(files), None, False
 
 
+def get_repo_contents_viz_indexed(token, path=""):
+    index, error, auth_error = get_repo_tree_index(get_github_client(token))
+    if auth_error:
+        return [], [], error, auth_error
+    listing = index.list_dir(path) if index is not None else None
+    if listing is None:
+        return get_repo_contents_viz_cached(token, path)
+
+    folders, files = listing
+    if not path:
+        folders = [f for f in folders if f != 'Visualizations']
+        files = [f for f in files if f not in ROOT_EXCLUDED_FILES_VIZ]
+    return folders, files, None, False
+
+
 def get_repo_contents_viz(token, path=""):
-    folders, files, _, _ = get_repo_contents_viz_cached(token, path)
+    folders, files, _, _ = get_repo_contents_viz_indexed(token, path)
     return folders, files
 
 
 def get_viz_file_content(token, path, file):
     file_path = f"{path}/{file}" if path else file
     client = get_github_client(token)
-    content, error, auth_error, _ = client.get_file_content(file_path)
+    index, _, _ = get_repo_tree_index(client)
+    sha = index.blob_sha(file_path) if index is not None else None
+    content, error, auth_error, _ = client.get_file_content(file_path, sha=sha)
     if auth_error:
         st.session_state['gh_token'] = None
         st.session_state['gh_token_validated'] = False
@@ -131,7 +152,7 @@ def render_viz_file_navigation(token):
     level = 0
 
     while True:
-        folders, files, error, auth_error = get_repo_contents_viz_cached(token, current_path)
+        folders, files, error, auth_error = get_repo_contents_viz_indexed(token, current_path)
         if auth_error:
             st.session_state['gh_token'] = None
             st.session_state['gh_token_validated'] = False
@@ -193,80 +214,82 @@ def render_viz_file_navigation(token):
     return selected_path, selected_file, selected_file_path
 
 
+def read_delimited_any_size(content):
+    # Large logger exports are read in downcast chunks to keep peak memory near the final frame size.
+    if len(content) >= STREAM_INGEST_MIN_BYTES:
+        return read_delimited_chunked(content)
+    return read_delimited(content)
+
+
 # Legacy stub kept for any future internal call-sites
 def get_github_file_content(token, path, file):
     content, _ = get_viz_file_content(token, path, file)
     return content
 
 
-_CHART_TYPES = [
-    "Line Plot", "Bar Plot", "Scatter Plot", "Histogram",
-    "Box Plot", "Heatmap", "Violin Plot", "Trend Analysis",
-]
-_CHART_STYLES = ["Default", "Seaborn", "ggplot (R-style)", "FiveThirtyEight", "Dark Mode"]
-_CHART_STYLE_MAP = {
-    "Default": "default",
-    "Seaborn": "seaborn-v0_8",
-    "ggplot (R-style)": "ggplot",
-    "FiveThirtyEight": "fivethirtyeight",
-    "Dark Mode": "dark_background",
-}
-
-
-def _apply_chart_style(style):
-    plt.style.use(_CHART_STYLE_MAP.get(style, "default"))
-
-
-def _render_chart_on_ax(df, x_axis, y_axis, plot_type, ax, custom_title=None, custom_x_label=None, custom_y_label=None):
-    """Render a single chart type onto ax. Returns False for Pair Plot (unsupported on an axis)."""
-    default_title = plot_type
-    if plot_type == "Line Plot":
-        for y in y_axis:
-            ax.plot(df[x_axis[0]], df[y], label=y)
-        default_title = "Line Plot"
-    elif plot_type == "Bar Plot":
-        for y in y_axis:
-            ax.bar(df[x_axis[0]], df[y], label=y)
-        default_title = "Bar Plot"
-    elif plot_type == "Scatter Plot":
-        for y in y_axis:
-            ax.scatter(df[x_axis[0]], df[y], label=y)
-        default_title = "Scatter Plot"
-    elif plot_type == "Histogram":
-        for x in x_axis:
-            ax.hist(df[x], bins=20, alpha=0.5, label=x)
-        default_title = "Histogram"
-    elif plot_type == "Box Plot":
-        sns.boxplot(data=df[y_axis], ax=ax)
-        default_title = "Box Plot"
-    elif plot_type == "Heatmap":
-        sns.heatmap(df.corr(numeric_only=True), annot=True, cmap="coolwarm", ax=ax)
-        default_title = "Heatmap"
-    elif plot_type == "Violin Plot":
-        sns.violinplot(data=df[y_axis], ax=ax)
-        default_title = "Violin Plot"
-    elif plot_type == "Trend Analysis":
-        for y in y_axis:
-            ax.plot(df[x_axis[0]], df[y], label=y, marker='o')
-            z = np.polyfit(range(len(df)), df[y], 1)
-            p = np.poly1d(z)
-            ax.plot(df[x_axis[0]], p(range(len(df))), "--", alpha=0.7, label=f"{y} trend")
-        default_title = "Trend Analysis"
-    elif plot_type == "Pair Plot":
-        return False
-    
-    ax.set_title(custom_title if custom_title else default_title)
-    ax.set_xlabel(custom_x_label if custom_x_label else (", ".join(x_axis) if x_axis else ""))
-    ax.set_ylabel(custom_y_label if custom_y_label else (", ".join(y_axis) if y_axis else ""))
-    ax.legend()
-    return True
-
-
-def _fig_to_buffer(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    return buf
+@st.cache_data(show_spinner=False)
+def get_sheet_names_cached(file_sha, _file_content):
+    # Keyed by blob SHA only; the leading underscore keeps Streamlit from hashing the bytes.
+    return list_workbook_sheets(_file_content)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def read_sheet_cached(file_sha, sheet_name, _file_content):
+    """Parse one workbook sheet once per (blob SHA, sheet); reruns reuse it, new sessions hit the Arrow sidecar."""
+    frame_cache = get_frame_cache()
+    df = frame_cache.get(file_sha, sheet_name)
+    if df is None:
+        df = pd.read_excel(BytesIO(_file_content), sheet_name=sheet_name)
+        frame_cache.put(file_sha, sheet_name, df)
+    return df
+
+
+def get_chart_png(df, spec, kind="single", data_key=None):
+    """PNG bytes for spec, from the render cache when the same chart of the same data was drawn before.
+
+    Cache misses are rendered by the shared render service off the script
+    thread. Returns (png_bytes, from_cache); png_bytes is None when the spec
+    can't be drawn. data_key identifies df's source bytes (see frame_key).
+    """
+    cache = get_figure_cache()
+    key = chart_cache_key({**spec, "kind": kind}, data_key or frame_key(df))
+    png = cache.get(key)
+    if png is not None:
+        return png, True
+    with st.spinner("Rendering chart..."):
+        png = get_render_service().render(kind, df, spec)
+    if png is not None:
+        cache.put(key, png)
+    return png, False
+
+
+def publish_visualization(token, name, description, png_bytes):
+    """Commit a rendered chart, its thumbnail and preview, and its catalog entry together.
+
+    The entry is appended to this month's catalog shard, re-applied on top of
+    any publish that lands first, so simultaneous uploads don't lose entries.
+    Returns (error, auth_error).
+    """
+    client = get_github_client(token)
+    image_path = f"Visualizations/{name}.png"
+    files, asset_fields = build_visualization_assets(png_bytes, image_path)
+    entry = {
+        "Name": f"{name}.png",
+        "Path": image_path,
+        "Description": description,
+        "Date": datetime.now().strftime("%Y-%m-%d"),
+        **asset_fields,
+    }
+    _, error, auth_error = client.commit_catalog_update(
+        files,
+        shard_path(),
+        lambda current: append_shard_entry(current, entry),
+        message=f"Add visualization {name}",
+    )
+    if error or auth_error:
+        return error, auth_error
+    invalidate_tree_index(client.repo)
+    return None, False
 
 
 def main():
@@ -280,6 +303,7 @@ def main():
     # Step 2: File Selection
     action = st.radio("Choose an action:", ("Upload a file", "Select a file"), key="viz_action_radio")
     df = None
+    data_key = None
 
     if action == "Upload a file":
         uploaded_file = st.file_uploader("Upload your file (xls, xlsx, csv, dat, txt):",
@@ -288,19 +312,17 @@ def main():
         if uploaded_file:
             st.success(f"File '{uploaded_file.name}' uploaded successfully.")
             if uploaded_file.name.endswith(("xls", "xlsx")):
-                excel_data = pd.ExcelFile(uploaded_file)
-                sheet_name = st.selectbox("Select a sheet:", excel_data.sheet_names)
-                df = excel_data.parse(sheet_name) if sheet_name else None
+                raw = uploaded_file.getvalue()
+                raw_sha = GitHubClient.git_blob_sha(raw)
+                sheet_name = st.selectbox("Select a sheet:", get_sheet_names_cached(raw_sha, raw))
+                df = read_sheet_cached(raw_sha, sheet_name, raw) if sheet_name else None
+                data_key = frame_key(df, source_sha=raw_sha, sheet_name=sheet_name)
             elif uploaded_file.name.endswith(("csv", "dat", "txt")):
-                raw = uploaded_file.read()
-                for enc in ["utf-8", "utf-8-sig", "latin-1", "cp1252"]:
-                    try:
-                        df = pd.read_csv(StringIO(raw.decode(enc)))
-                        break
-                    except Exception:
-                        continue
+                raw = uploaded_file.getvalue()
+                df, parse_error, _ = read_delimited_any_size(raw)
+                data_key = frame_key(df, source_sha=GitHubClient.git_blob_sha(raw))
                 if df is None:
-                    st.error("Unable to parse the uploaded file.")
+                    st.error(f"Unable to parse the uploaded file: {parse_error}")
     elif action == "Select a file":
         selected_path, file_name, selected_file_path = render_viz_file_navigation(token)
         if selected_file_path:
@@ -315,28 +337,29 @@ def main():
             else:
                 if file_name.endswith(("xls", "xlsx")):
                     try:
-                        excel_data = pd.ExcelFile(BytesIO(file_content))
-                        sheet_name = st.selectbox("Select a sheet:", excel_data.sheet_names, key="viz_sheet")
+                        file_sha = GitHubClient.git_blob_sha(file_content)
+                        sheet_name = st.selectbox(
+                            "Select a sheet:", get_sheet_names_cached(file_sha, file_content), key="viz_sheet"
+                        )
                         if sheet_name:
-                            df = excel_data.parse(sheet_name)
+                            df = read_sheet_cached(file_sha, sheet_name, file_content)
+                            data_key = frame_key(df, source_sha=file_sha, sheet_name=sheet_name)
                     except Exception as exc:
                         st.error(f"Unable to read Excel file: {exc}")
                 elif file_name.endswith(("csv", "dat", "txt")):
-                    for enc in ["utf-8", "utf-8-sig", "latin-1", "cp1252"]:
-                        try:
-                            df = pd.read_csv(StringIO(file_content.decode(enc)))
-                            break
-                        except Exception:
-                            continue
+                    df, parse_error, _ = read_delimited_any_size(file_content)
+                    data_key = frame_key(df, source_sha=GitHubClient.git_blob_sha(file_content))
                     if df is None:
-                        st.error("Unable to parse the file.")
+                        st.error(f"Unable to parse the file: {parse_error}")
 
-    # Persist df across page navigations
+    # Persist df (and the key naming its source bytes) across page navigations
     if df is not None:
         st.session_state['viz_df'] = df
+        st.session_state['viz_df_key'] = data_key
         st.session_state['viz_df_source'] = action
     elif st.session_state.get('viz_df') is not None and st.session_state.get('viz_df_source') == action:
         df = st.session_state['viz_df']
+        data_key = st.session_state.get('viz_df_key')
 
     if df is not None:
         with st.expander("Data Preview", expanded=True):
@@ -371,9 +394,9 @@ def main():
             with _cc2:
                 y1 = st.multiselect("Y-axis:", options=df.columns.tolist(), key="cmp_y1")
             with _cc3:
-                pt1 = st.selectbox("Chart type:", _CHART_TYPES, key="cmp_pt1")
+                pt1 = st.selectbox("Chart type:", CHART_TYPES, key="cmp_pt1")
             with _cc4:
-                cs1 = st.selectbox("Style:", _CHART_STYLES, key="cmp_cs1")
+                cs1 = st.selectbox("Style:", CHART_STYLES, key="cmp_cs1")
 
             st.markdown("**Chart 2**")
             _cd1, _cd2, _cd3, _cd4 = st.columns(4)
@@ -382,9 +405,9 @@ def main():
             with _cd2:
                 y2 = st.multiselect("Y-axis:", options=df.columns.tolist(), key="cmp_y2")
             with _cd3:
-                pt2 = st.selectbox("Chart type:", _CHART_TYPES, key="cmp_pt2")
+                pt2 = st.selectbox("Chart type:", CHART_TYPES, key="cmp_pt2")
             with _cd4:
-                cs2 = st.selectbox("Style:", _CHART_STYLES, key="cmp_cs2")
+                cs2 = st.selectbox("Style:", CHART_STYLES, key="cmp_cs2")
 
             st.markdown("**Customization**")
             _cmp_cust1, _cmp_cust2, _cmp_cust3 = st.columns(3)
@@ -420,42 +443,26 @@ def main():
                     for _e in _errs:
                         st.warning(_e)
                 else:
+                    _cmp_spec = {
+                        "charts": [
+                            {"x_axis": x1, "y_axis": y1, "plot_type": pt1, "style": cs1, "title": cmp_title1},
+                            {"x_axis": x2, "y_axis": y2, "plot_type": pt2, "style": cs2, "title": cmp_title2},
+                        ],
+                        "x_label": cmp_x_label,
+                        "y_label": _cmp_y_label,
+                        "align_x": align_x,
+                        "align_y": align_y,
+                    }
                     try:
-                        _apply_chart_style(cs1)
-                        _fig, (_ax1, _ax2) = plt.subplots(1, 2, figsize=(14, 6))
-                        _ok1 = _render_chart_on_ax(
-                            df, x1, y1, pt1, _ax1,
-                            custom_title=cmp_title1 if cmp_title1 else None,
-                            custom_x_label=cmp_x_label if cmp_x_label else None,
-                            custom_y_label=_cmp_y_label if _cmp_y_label else None
-                        )
-                        _ok2 = _render_chart_on_ax(
-                            df, x2, y2, pt2, _ax2,
-                            custom_title=cmp_title2 if cmp_title2 else None,
-                            custom_x_label=cmp_x_label if cmp_x_label else None,
-                            custom_y_label=_cmp_y_label if _cmp_y_label else None
-                        )
-
-                        if not _ok1 or not _ok2:
+                        _png, _cached = get_chart_png(df, _cmp_spec, kind="comparative", data_key=data_key)
+                        if _png is None:
                             st.warning("Pair Plot is not supported in comparative mode.")
                         else:
-                            if align_x:
-                                _xmin = min(_ax1.get_xlim()[0], _ax2.get_xlim()[0])
-                                _xmax = max(_ax1.get_xlim()[1], _ax2.get_xlim()[1])
-                                _ax1.set_xlim(_xmin, _xmax)
-                                _ax2.set_xlim(_xmin, _xmax)
-                            if align_y:
-                                _ymin = min(_ax1.get_ylim()[0], _ax2.get_ylim()[0])
-                                _ymax = max(_ax1.get_ylim()[1], _ax2.get_ylim()[1])
-                                _ax1.set_ylim(_ymin, _ymax)
-                                _ax2.set_ylim(_ymin, _ymax)
-                            _fig.suptitle("Comparative Visualization", fontsize=13)
-                            _fig.tight_layout()
-                            st.session_state["cmp_buf_combined"] = _fig_to_buffer(_fig)
+                            st.session_state["cmp_buf_combined"] = io.BytesIO(_png)
+                            if _cached:
+                                st.caption("Served from the render cache.")
                     except Exception as _exc:
                         st.error(f"Error generating comparative visualization: {_exc}")
-                    finally:
-                        plt.close("all")
 
             _bc = st.session_state.get("cmp_buf_combined")
             if _bc:
@@ -479,53 +486,17 @@ def main():
                         st.warning("Please provide both a name and a description for the visualization.")
                     else:
                         try:
-                            _cmp_path = f"Visualizations/{_cmp_name}.png"
-                            _up_url = f"https://api.github.com/repos/Chakrapani2122/Regen-Ag-Data/contents/{_cmp_path}"
-                            _up_resp = requests.put(
-                                _up_url,
-                                headers={"Authorization": f"token {token}"},
-                                json={
-                                    "message": f"Add visualization {_cmp_name}",
-                                    "content": base64.b64encode(st.session_state["cmp_buf_combined"].getvalue()).decode("utf-8"),
-                                    "sha": None,
-                                },
+                            _up_err, _up_auth = publish_visualization(
+                                token, _cmp_name, _cmp_desc, st.session_state["cmp_buf_combined"].getvalue()
                             )
-                            _up_resp.raise_for_status()
-
-                            _xml_path = "Visualizations/visualizations.xml"
-                            _xml_headers = {"Authorization": f"token {token}"}
-                            _xml_url = f"https://api.github.com/repos/Chakrapani2122/Regen-Ag-Data/contents/{_xml_path}"
-                            _xml_content = "<Images></Images>"
-                            _xml_sha = None
-                            try:
-                                _xml_resp = requests.get(_xml_url, headers=_xml_headers)
-                                if _xml_resp.status_code == 200:
-                                    _xml_json = _xml_resp.json()
-                                    _xml_content = base64.b64decode(_xml_json["content"]).decode("utf-8")
-                                    _xml_sha = _xml_json["sha"]
-                                    if not _xml_content.strip():
-                                        _xml_content = "<Images></Images>"
-                            except Exception:
-                                pass
-
-                            _root = ET.fromstring(_xml_content)
-                            _new_img = ET.SubElement(_root, "Image")
-                            ET.SubElement(_new_img, "Name").text = f"{_cmp_name}.png"
-                            ET.SubElement(_new_img, "Path").text = _cmp_path
-                            ET.SubElement(_new_img, "Description").text = _cmp_desc
-                            ET.SubElement(_new_img, "Date").text = datetime.now().strftime("%Y-%m-%d")
-
-                            _upd_xml = ET.tostring(_root, encoding="unicode")
-                            _xml_put_data = {
-                                "message": f"Update visualizations.xml with {_cmp_name}",
-                                "content": base64.b64encode(_upd_xml.encode("utf-8")).decode("utf-8"),
-                            }
-                            if _xml_sha:
-                                _xml_put_data["sha"] = _xml_sha
-                            _xml_put = requests.put(_xml_url, headers=_xml_headers, json=_xml_put_data)
-                            _xml_put.raise_for_status()
-
-                            st.success(f"Comparative visualization '{_cmp_name}' uploaded successfully.")
+                            if _up_auth:
+                                st.session_state['gh_token'] = None
+                                st.session_state['gh_token_validated'] = False
+                                st.error("Authentication failed. Please re-enter your security token.")
+                            elif _up_err:
+                                raise RuntimeError(_up_err)
+                            else:
+                                st.success(f"Comparative visualization '{_cmp_name}' uploaded successfully.")
                         except Exception as _ue:
                             st.error(f"Error uploading visualization: {_ue}")
 
@@ -536,11 +507,16 @@ def main():
         
         # Quick insights
         with st.expander("💡 Quick Data Insights"):
-            numeric_cols = df.select_dtypes(include=['number']).columns
+            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
             if len(numeric_cols) > 0:
+                memo_key = data_key or frame_key(df)
                 st.write(f"**Numeric columns:** {len(numeric_cols)}")
-                st.write(f"**Highest correlation:** {df[numeric_cols].corr().abs().unstack().sort_values(ascending=False).iloc[1]:.3f}")
-                st.write(f"**Missing values:** {df.isnull().sum().sum()}")
+                if len(numeric_cols) > 1:
+                    corr_values = get_correlation(df, numeric_cols, memo_key).abs().to_numpy()
+                    np.fill_diagonal(corr_values, np.nan)
+                    if not np.isnan(corr_values).all():
+                        st.write(f"**Highest correlation:** {np.nanmax(corr_values):.3f}")
+                st.write(f"**Missing values:** {get_missing_counts(df, memo_key).sum()}")
         
         col1, col2, col3, col4 = st.columns(4)
 
@@ -556,7 +532,7 @@ def main():
             ], key="viz_plot_type")
             
         with col4:
-            chart_style = st.selectbox("Chart Style:", ["Default", "Seaborn", "ggplot (R-style)", "FiveThirtyEight", "Dark Mode"], key="viz_chart_style")
+            chart_style = st.selectbox("Chart Style:", CHART_STYLES, key="viz_chart_style")
 
         # Maintain visualization state after interactions
         if 'visualization_buffer' not in st.session_state:
@@ -572,43 +548,25 @@ def main():
             custom_y_label = st.text_input("Y-Axis Label (optional):", key="viz_custom_y_label")
 
         if st.button("Generate Visualization"):
-            # Apply the selected style
-            if chart_style == "Default":
-                plt.style.use('default')
-            elif chart_style == "Seaborn":
-                plt.style.use('seaborn-v0_8')
-            elif chart_style == "ggplot (R-style)":
-                plt.style.use('ggplot')
-            elif chart_style == "FiveThirtyEight":
-                plt.style.use('fivethirtyeight')
-            elif chart_style == "Dark Mode":
-                plt.style.use('dark_background')
-
-            fig, ax = plt.subplots()
-
-            if plot_type == "Pair Plot":
-                sns.pairplot(df[x_axis + y_axis])
-                st.pyplot()  # Pair plot creates its own figure
-                st.session_state['visualization_buffer'] = None
-            else:
-                _ok = _render_chart_on_ax(
-                    df, x_axis, y_axis, plot_type, ax,
-                    custom_title=custom_title if custom_title else None,
-                    custom_x_label=custom_x_label if custom_x_label else None,
-                    custom_y_label=custom_y_label if custom_y_label else None
-                )
-
-                buf = io.BytesIO()
-                fig.savefig(buf, format='png')
-                buf.seek(0)
-                st.session_state['visualization_buffer'] = buf
+            chart_spec = {
+                "x_axis": x_axis,
+                "y_axis": y_axis,
+                "plot_type": plot_type,
+                "style": chart_style,
+                "title": custom_title,
+                "x_label": custom_x_label,
+                "y_label": custom_y_label,
+            }
+            png, from_cache = get_chart_png(
+                df, chart_spec, kind="pair" if plot_type == "Pair Plot" else "single", data_key=data_key
+            )
+            st.session_state['visualization_buffer'] = io.BytesIO(png)
+            if from_cache:
+                st.caption("Served from the render cache.")
 
         # Display the visualization if it exists
         if st.session_state['visualization_buffer']:
-            buf = st.session_state['visualization_buffer']
-            buf.seek(0)  # Ensure the buffer is at the start
-            image = plt.imread(buf, format='png')
-            st.image(image, caption="Generated Visualization", use_column_width=True)
+            st.image(st.session_state['visualization_buffer'].getvalue(), caption="Generated Visualization", use_column_width=True)
 
         # Add download options
         if st.session_state['visualization_buffer']:
@@ -657,54 +615,17 @@ def main():
                 st.warning("Please provide both a name and a description for the visualization.")
             else:
                 try:
-                    visualization_path = f"Visualizations/{visualization_name}.png"
-                    # GitHub API call to create or update file
-                    url = f"https://api.github.com/repos/Chakrapani2122/Regen-Ag-Data/contents/{visualization_path}"
-                    response = requests.put(
-                        url,
-                        headers={"Authorization": f"token {token}"},
-                        json={
-                            "message": f"Add visualization {visualization_name}",
-                            "content": base64.b64encode(st.session_state['visualization_buffer'].getvalue()).decode("utf-8"),
-                            "sha": None  # Always set sha to None for new files
-                        }
+                    error, auth_error = publish_visualization(
+                        token, visualization_name, visualization_description,
+                        st.session_state['visualization_buffer'].getvalue()
                     )
-                    response.raise_for_status()
-
-                    xml_path = "Visualizations/visualizations.xml"
-                    headers = {"Authorization": f"token {token}"}
-                    xml_url = f"https://api.github.com/repos/Chakrapani2122/Regen-Ag-Data/contents/{xml_path}"
-                    xml_content = "<Images></Images>"
-                    sha = None
-                    try:
-                        xml_response = requests.get(xml_url, headers=headers)
-                        if xml_response.status_code == 200:
-                            xml_json = xml_response.json()
-                            xml_content = base64.b64decode(xml_json["content"]).decode("utf-8")
-                            sha = xml_json["sha"]
-                            if not xml_content.strip():
-                                xml_content = "<Images></Images>"
-                    except Exception:
-                        pass
-
-                    root = ET.fromstring(xml_content)
-                    new_image = ET.SubElement(root, "Image")
-                    ET.SubElement(new_image, "Name").text = f"{visualization_name}.png"
-                    ET.SubElement(new_image, "Path").text = visualization_path
-                    ET.SubElement(new_image, "Description").text = visualization_description
-                    creation_date = datetime.now().strftime("%Y-%m-%d")
-                    ET.SubElement(new_image, "Date").text = creation_date
-
-                    updated_xml_content = ET.tostring(root, encoding="unicode")
-                    put_data = {
-                        "message": f"Update visualizations.xml with {visualization_name}",
-                        "content": base64.b64encode(updated_xml_content.encode("utf-8")).decode("utf-8")
-                    }
-                    if sha:
-                        put_data["sha"] = sha
-                    put_response = requests.put(xml_url, headers=headers, json=put_data)
-                    put_response.raise_for_status()
-
+                    if auth_error:
+                        st.session_state['gh_token'] = None
+                        st.session_state['gh_token_validated'] = False
+                        st.error("Authentication failed. Please re-enter your security token.")
+                        return
+                    if error:
+                        raise RuntimeError(error)
                     st.success(f"Visualization '{visualization_name}' uploaded successfully.")
                 except Exception as e:
                     st.error(f"Error uploading visualization: {e}")
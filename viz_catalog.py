@@ -0,0 +1,280 @@
+import hashlib
+import json
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+# Legacy single-document catalog; still read (never rewritten) so older entries keep showing.
+CATALOG_PATH = "Visualizations/visualizations.xml"
+# New entries are appended as JSON lines to one shard per month under this folder.
+CATALOG_SHARD_DIR = "Visualizations/catalog"
+CATALOG_INDEX_MAX_ENTRIES = 8
+PARSED_BLOB_CACHE_ENTRIES = 128
+TOKEN_MASK_CACHE_ENTRIES = 64
+CATALOG_FIELDS = ["Name", "Path", "Description", "Date"]
+SORT_ORDERS = ["Date (Newest)", "Date (Oldest)", "Name (A-Z)", "Name (Z-A)"]
+
+# Letters/digits only, so "soil_moisture_2024.png" indexes as soil, moisture, 2024, png.
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _ascending_and_descending(values: List[str]):
+    """Stable ascending and descending orderings, matching sorted(..., reverse=...) on ties."""
+    _, ranks = np.unique(np.array(values, dtype=object), return_inverse=True)
+    ranks = ranks.ravel()
+    return np.argsort(ranks, kind="stable"), np.argsort(-ranks, kind="stable")
+
+
+def records_from_xml(xml_bytes: Optional[bytes]) -> List[Dict[str, str]]:
+    text = xml_bytes.decode("utf-8") if xml_bytes else ""
+    root = ET.fromstring(text) if text.strip() else ET.Element("Images")
+    return [
+        {child.tag: (child.text or "") for child in image}
+        for image in root.findall("Image")
+    ]
+
+
+def records_from_shard(shard_bytes: Optional[bytes]) -> List[Dict[str, str]]:
+    """Entries of one JSON-lines shard; blank or malformed lines (e.g. a torn manual edit) are skipped."""
+    records = []
+    for line in (shard_bytes or b"").decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append({str(key): "" if value is None else str(value) for key, value in record.items()})
+    return records
+
+
+def shard_path(day: Optional[date] = None) -> str:
+    """Shard that entries created on day (default: today) are appended to."""
+    day = day or date.today()
+    return f"{CATALOG_SHARD_DIR}/{day:%Y-%m}.jsonl"
+
+
+def append_shard_entry(shard_bytes: Optional[bytes], entry: Dict[str, str]) -> bytes:
+    """Shard bytes with entry appended as one more JSON line."""
+    current = shard_bytes or b""
+    if current and not current.endswith(b"\n"):
+        current += b"\n"
+    return current + json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class CatalogIndex:
+    """Columnar view of the visualization catalog with a token index and presorted orderings.
+
+    Built once per catalog blob SHA; search and sort then work on integer
+    row arrays instead of walking XML elements.
+    """
+
+    def __init__(self, records: List[Dict[str, str]]):
+        fields = list(CATALOG_FIELDS)
+        for record in records:
+            fields.extend(name for name in record if name not in fields)
+        self.fields = fields
+        self.columns = {name: [record.get(name, "") for record in records] for name in fields}
+        self.size = len(records)
+
+        # Lowercased name + description, exactly what the substring search used to scan.
+        self._haystack = [
+            (name + description).lower()
+            for name, description in zip(self.columns["Name"], self.columns["Description"])
+        ]
+        postings: Dict[str, set] = {}
+        for row, (name, description) in enumerate(zip(self.columns["Name"], self.columns["Description"])):
+            for token in _tokens(name) + _tokens(description):
+                postings.setdefault(token, set()).add(row)
+        self._vocabulary = sorted(postings)
+        self._postings = [np.fromiter(sorted(postings[token]), dtype=np.int64) for token in self._vocabulary]
+        self._token_masks: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._mask_lock = threading.Lock()
+
+        date_asc, date_desc = _ascending_and_descending(self.columns["Date"])
+        name_asc, name_desc = _ascending_and_descending(self.columns["Name"])
+        self._orders = {
+            "Date (Newest)": date_desc,
+            "Date (Oldest)": date_asc,
+            "Name (A-Z)": name_asc,
+            "Name (Z-A)": name_desc,
+        }
+
+    @classmethod
+    def from_xml(cls, xml_bytes: bytes) -> "CatalogIndex":
+        return cls(records_from_xml(xml_bytes))
+
+    def _cached_mask(self, key: tuple, compute) -> np.ndarray:
+        """Memoized row mask; every rerun of the page repeats the same query."""
+        with self._mask_lock:
+            mask = self._token_masks.get(key)
+            if mask is not None:
+                self._token_masks.move_to_end(key)
+                return mask
+        mask = compute()
+        with self._mask_lock:
+            self._token_masks[key] = mask
+            while len(self._token_masks) > TOKEN_MASK_CACHE_ENTRIES:
+                self._token_masks.popitem(last=False)
+        return mask
+
+    def _token_mask(self, token: str) -> np.ndarray:
+        """Rows with a word starting with token."""
+        def compute():
+            mask = np.zeros(self.size, dtype=bool)
+            start = bisect_left(self._vocabulary, token)
+            for idx in range(start, len(self._vocabulary)):
+                if not self._vocabulary[idx].startswith(token):
+                    break
+                mask[self._postings[idx]] = True
+            return mask
+        return self._cached_mask(("token", token), compute)
+
+    def _substring_mask(self, query: str) -> np.ndarray:
+        """Rows whose lowercased name + description contain query (the page's original filter)."""
+        return self._cached_mask(
+            ("substring", query),
+            lambda: np.fromiter((query in text for text in self._haystack), dtype=bool, count=self.size),
+        )
+
+    def match_mask(self, query: str) -> np.ndarray:
+        """Rows the original substring filter matches, plus rows containing every query word as a word prefix.
+
+        The substring scan is always included, so mid-word fragments
+        ("moisture" in "SoilMoisture2024") match exactly as before.
+        """
+        # Not stripped: the original filter matched the query text verbatim.
+        query = (query or "").lower()
+        if not query:
+            return np.ones(self.size, dtype=bool)
+        mask = self._substring_mask(query)
+        tokens = _tokens(query)
+        if tokens:
+            prefix = np.ones(self.size, dtype=bool)
+            for token in tokens:
+                prefix &= self._token_mask(token)
+            mask = mask | prefix
+        return mask
+
+    def search(self, query: str = "", sort_by: str = "Date (Newest)") -> np.ndarray:
+        """Matching row numbers in the requested order."""
+        order = self._orders.get(sort_by, self._orders["Date (Newest)"])
+        return order[self.match_mask(query)[order]]
+
+    def row(self, idx: int) -> Dict[str, str]:
+        return {name: values[idx] for name, values in self.columns.items()}
+
+
+_indexes: "OrderedDict[str, CatalogIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+_parsed: "OrderedDict[tuple, List[Dict[str, str]]]" = OrderedDict()
+_parsed_lock = threading.Lock()
+
+
+def _cached_records(path: str, sha: Optional[str], data: bytes) -> List[Dict[str, str]]:
+    """Parsed entries of one catalog blob, parsed at most once per SHA."""
+    parser = records_from_xml if path == CATALOG_PATH else records_from_shard
+    if not sha:
+        return parser(data)
+    key = (path == CATALOG_PATH, sha)
+    with _parsed_lock:
+        records = _parsed.get(key)
+        if records is not None:
+            _parsed.move_to_end(key)
+            return records
+    records = parser(data)
+    with _parsed_lock:
+        _parsed[key] = records
+        while len(_parsed) > PARSED_BLOB_CACHE_ENTRIES:
+            _parsed.popitem(last=False)
+    return records
+
+
+def merge_records(sources: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """Concatenate sources in order; a later entry with the same Path replaces the earlier one in place."""
+    merged: Dict[str, Dict[str, str]] = {}
+    unkeyed: List[Dict[str, str]] = []
+    for records in sources:
+        for record in records:
+            path = record.get("Path")
+            if path:
+                merged[path] = record
+            else:
+                unkeyed.append(record)
+    return list(merged.values()) + unkeyed
+
+
+def catalog_sources(client, tree_index) -> Tuple[Optional[List[Tuple[str, Optional[str]]]], Optional[str], bool]:
+    """(path, blob SHA) of the legacy XML and then every monthly shard, oldest first.
+
+    Uses the tree index when it can answer, otherwise lists the shard folder
+    through the contents API. SHAs are None where the index doesn't know them.
+    """
+    xml_sha = tree_index.blob_sha(CATALOG_PATH) if tree_index is not None else None
+    if tree_index is not None and tree_index.list_dir(CATALOG_SHARD_DIR.rpartition("/")[0]) is not None:
+        listing = tree_index.list_dir(CATALOG_SHARD_DIR)
+        shard_paths = [f"{CATALOG_SHARD_DIR}/{name}" for name in (listing[1] if listing else []) if name.endswith(".jsonl")]
+        sources = [(CATALOG_PATH, xml_sha)] if xml_sha else []
+        return sources + [(path, tree_index.blob_sha(path)) for path in sorted(shard_paths)], None, False
+
+    sources: List[Tuple[str, Optional[str]]] = [(CATALOG_PATH, xml_sha)]
+    items, error, auth_error = client.list_contents(CATALOG_SHARD_DIR)
+    if auth_error:
+        return None, error, auth_error
+    # Any other failure (typically a 404 before the first shard exists) means no shards yet.
+    for item in sorted(items or [], key=lambda item: item.get("name", "")):
+        if item.get("type") == "file" and item.get("name", "").endswith(".jsonl"):
+            sources.append((item["path"], item.get("sha")))
+    return sources, None, False
+
+
+def load_catalog(client, tree_index) -> Tuple[Optional[CatalogIndex], Optional[str], bool]:
+    """CatalogIndex over the legacy XML plus all monthly shards.
+
+    Blobs come from the SHA-keyed blob cache and are parsed once per SHA, so
+    after an upload only the current month's shard is fetched and parsed
+    again. The merged index is memoized on the combined set of SHAs.
+    """
+    sources, error, auth_error = catalog_sources(client, tree_index)
+    if sources is None:
+        return None, error, auth_error
+
+    loaded = []
+    for path, sha in sources:
+        data, error, auth_error, metadata = client.get_file_content(path, sha=sha)
+        if auth_error:
+            return None, error, auth_error
+        if data is None:
+            if path == CATALOG_PATH:
+                # No legacy catalog (or it was removed); shards alone are a valid catalog.
+                continue
+            return None, error or f"Could not load {path}.", False
+        loaded.append((path, (metadata or {}).get("sha") or sha, data))
+
+    signature = None
+    if all(sha for _, sha, _ in loaded):
+        signature = hashlib.sha1("\n".join(f"{path}\0{sha}" for path, sha, _ in loaded).encode("utf-8")).hexdigest()
+        with _indexes_lock:
+            index = _indexes.get(signature)
+            if index is not None:
+                _indexes.move_to_end(signature)
+                return index, None, False
+
+    index = CatalogIndex(merge_records([_cached_records(path, sha, data) for path, sha, data in loaded]))
+    if signature:
+        with _indexes_lock:
+            _indexes[signature] = index
+            while len(_indexes) > CATALOG_INDEX_MAX_ENTRIES:
+                _indexes.popitem(last=False)
+    return index, None, False